@@ -105,6 +105,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger("cyberguard")
 
+@app.on_event("startup")
+def warm_up_ml_detector():
+    """Warm up ML predictions in each worker before requests arrive"""
+    if ENHANCED_FEATURES:
+        ml_detector.start_warmup()
+
 # --------------------------
 # Models
 # --------------------------
@@ -1,46 +1,172 @@
 #!/usr/bin/env python3
+import gzip
 import http.server
 import socketserver
 import json
 import urllib.parse
 import re
+import threading
+from collections import OrderedDict
 from http import HTTPStatus
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Longest inputs /check will scan; USSD codes are short and SMS bodies
+# are capped well above concatenated-SMS length
+MAX_CODE_LENGTH = 64
+MAX_SMS_LENGTH = 10000
+
+# SMS risk patterns, fused into one alternation each so a message is scanned
+# once per tier. Every alternative is a zero-width lookahead, so overlapping
+# hits (e.g. "won ... prize" and "claim ... prize") are all still reported.
+HIGH_RISK_PATTERNS = (
+    "won.*prize", "win.*lottery", "congratulations.*won",
+    "claim.*prize", "free.*gift", "urgent.*account",
+    "bvn.*required", "password.*reset", "pin.*verification",
+    "account.*suspended", "verification.*required"
+)
+
+MEDIUM_RISK_PATTERNS = (
+    "million", "cash.*award", "immediately", "click.*link",
+    "call.*now", "limited.*time", "exclusive.*offer"
+)
+
+# The patterns stay readable for the reasons shown to users; when compiled,
+# each unbounded ".*" gap is capped so a scan never backtracks over the
+# rest of a long message from every candidate start
+_MAX_GAP = 80
+
+
+def _bounded(pattern):
+    """Compile-time form of a risk pattern with its .* gaps capped"""
+    return pattern.replace('.*', f'.{{0,{_MAX_GAP}}}')
+
+
+HIGH_RE = re.compile('|'.join(f'(?=(?P<h{i}>{_bounded(p)}))' for i, p in enumerate(HIGH_RISK_PATTERNS)), re.IGNORECASE)
+HIGH_NAMES = {f'h{i}': p for i, p in enumerate(HIGH_RISK_PATTERNS)}
+
+MED_RE = re.compile('|'.join(f'(?=(?P<m{i}>{_bounded(p)}))' for i, p in enumerate(MEDIUM_RISK_PATTERNS)), re.IGNORECASE)
+MED_NAMES = {f'm{i}': p for i, p in enumerate(MEDIUM_RISK_PATTERNS)}
+
+# Single-signal SMS heuristics
+URL_RE = re.compile(r'http://|https://|www\.|bit\.ly|tinyurl|click.{0,40}here', re.IGNORECASE)
+PHONE_RE = re.compile(r'call.{0,40}\d|phone.{0,40}number|contact.{0,40}us|dial.{0,40}\d|send.{0,40}number', re.IGNORECASE)
+MONEY_RE = re.compile(r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money', re.IGNORECASE)
+
+
+def _json_bytes(obj):
+    """Serialize obj straight to JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _fused_hits(regex, text):
+    """Return the group names matched by a fused regex, in pattern order"""
+    hits = {m.lastgroup for m in regex.finditer(text)}
+    return sorted(hits, key=lambda name: int(name[1:]))
+
+
 class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.load_database()
+    # JSON-encoded check results keyed on (kind, input). A new handler is
+    # created per request, so the cache lives on the class; the server runs
+    # handlers on concurrent threads, so it is guarded by a lock.
+    RESULT_CACHE_SIZE = 4096
+    _result_cache = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    
+    # Lookup tables compiled from the database are shared the same way
+    _loaded = False
     
-    def load_database(self):
-        """Load the USSD database"""
+    # Every response sets Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    
+    @classmethod
+    def load_database(cls):
+        """Load the USSD database and build its lookup tables, once per process"""
+        if cls._loaded:
+            return
+        
         try:
             with open('CyberGuardAndroid/app/src/main/assets/ussd_database.json', 'r') as f:
-                self.database = json.load(f)
+                database = json.load(f)
             print("✅ Loaded USSD database successfully")
-            print(f"   - Safe codes: {len(self.database['safe_codes'])}")
-            print(f"   - Scam patterns: {len(self.database['scam_patterns'])}")
-            print(f"   - Scam keywords: {len(self.database['scam_keywords'])}")
+            print(f"   - Safe codes: {len(database['safe_codes'])}")
+            print(f"   - Scam patterns: {len(database['scam_patterns'])}")
+            print(f"   - Scam keywords: {len(database['scam_keywords'])}")
         except Exception as e:
             print(f"❌ Failed to load database: {e}")
-            self.database = {"safe_codes": [], "scam_patterns": [], "scam_keywords": []}
+            database = {"safe_codes": [], "scam_patterns": [], "scam_keywords": []}
+        
+        # Normalize the lookup tables once so the checkers never lowercase them
+        cls._safe_map = {}
+        for sc in database["safe_codes"]:
+            cls._safe_map.setdefault(sc["code"].lower().strip(), sc["description"])
+        # Keywords differing only in case are one keyword; the first entry wins
+        keywords_lower = {}
+        for kw in database["scam_keywords"]:
+            keywords_lower.setdefault(kw.lower(), kw)
+        cls._scam_keywords_lower = list(keywords_lower.items())
+        
+        # Scam patterns compiled once, kept in database order so the first
+        # pattern that matches is the one reported
+        cls._scam_pattern_res = [(p, re.compile(p, re.IGNORECASE)) for p in database["scam_patterns"]]
+        
+        # One automaton over every keyword: a single pass finds all hits.
+        # Without pyahocorasick, a literal alternation does the same sweep.
+        cls.ac = None
+        cls._keyword_re = None
+        if cls._scam_keywords_lower:
+            if ahocorasick is not None:
+                cls.ac = ahocorasick.Automaton()
+                for keyword_lower, _ in cls._scam_keywords_lower:
+                    cls.ac.add_word(keyword_lower, keyword_lower)
+                cls.ac.make_automaton()
+            else:
+                by_length = sorted({kw for kw, _ in cls._scam_keywords_lower}, key=len, reverse=True)
+                cls._keyword_re = re.compile(f"(?=({'|'.join(map(re.escape, by_length))}))")
+        
+        # Only the derived tables are kept; the parsed JSON is dropped here
+        cls._loaded = True
+    
+    def find_scam_keywords(self, normalized):
+        """Return the scam keywords contained in normalized, in database order"""
+        if self.ac is not None:
+            hits = {keyword_lower for _, keyword_lower in self.ac.iter(normalized)}
+        elif self._keyword_re is not None:
+            # The alternation reports the longest keyword at each position;
+            # shorter keywords starting there are prefixes of that hit
+            longest = {m.group(1) for m in self._keyword_re.finditer(normalized)}
+            hits = {kw for kw, _ in self._scam_keywords_lower if any(hit.startswith(kw) for hit in longest)}
+        else:
+            hits = set()
+        return [keyword for keyword_lower, keyword in self._scam_keywords_lower if keyword_lower in hits]
     
     def check_ussd_code(self, code):
         """Check USSD code security (same logic as Android app)"""
         normalized = code.lower().strip()
         
         # Check safe codes
-        for safe_code in self.database["safe_codes"]:
-            if safe_code["code"].lower() == normalized:
-                return {
-                    "safe": True,
-                    "confidence": 95,
-                    "message": f"✅ SAFE - {safe_code['description']}",
-                    "color": "green"
-                }
+        description = self._safe_map.get(normalized)
+        if description is not None:
+            return {
+                "safe": True,
+                "confidence": 95,
+                "message": f"✅ SAFE - {description}",
+                "color": "green"
+            }
         
         # Check scam patterns
-        for pattern in self.database["scam_patterns"]:
-            if re.search(pattern, normalized, re.IGNORECASE):
+        for pattern, regex in self._scam_pattern_res:
+            if regex.search(normalized):
                 return {
                     "safe": False,
                     "confidence": 90,
@@ -49,10 +175,7 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
                 }
         
         # Check scam keywords
-        found_keywords = []
-        for keyword in self.database["scam_keywords"]:
-            if keyword in normalized:
-                found_keywords.append(keyword)
+        found_keywords = self.find_scam_keywords(normalized)
         
         if found_keywords:
             return {
@@ -69,6 +192,32 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             "color": "gray"
         }
     
+    def iter_sms_risks(self, message):
+        """Lazily yield (points, reason) for each risk found in an SMS"""
+        # Every regex is case-insensitive, so they scan the message as-is
+        # Check patterns
+        for name in _fused_hits(HIGH_RE, message):
+            yield 8, f"High-risk: '{HIGH_NAMES[name]}'"
+        
+        for name in _fused_hits(MED_RE, message):
+            yield 4, f"Medium-risk: '{MED_NAMES[name]}'"
+        
+        # Check scam keywords (lowercased copy made only if scoring gets here)
+        for keyword in self.find_scam_keywords(message.lower()):
+            yield 3, f"Keyword: '{keyword}'"
+        
+        # Check for suspicious URLs
+        if URL_RE.search(message):
+            yield 6, "Suspicious URL"
+        
+        # Check for phone number requests
+        if PHONE_RE.search(message):
+            yield 5, "Phone request"
+        
+        # Check for money mentions
+        if MONEY_RE.search(message):
+            yield 3, "Money mention"
+    
     def check_sms_message(self, message):
         """Check SMS message security (same logic as Android app)"""
         if not message.strip():
@@ -79,55 +228,15 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
                 "color": "gray"
             }
         
-        normalized = message.lower()
         score = 0
         reasons = []
         
-        # High-risk patterns
-        high_risk_patterns = [
-            "won.*prize", "win.*lottery", "congratulations.*won", 
-            "claim.*prize", "free.*gift", "urgent.*account",
-            "bvn.*required", "password.*reset", "pin.*verification",
-            "account.*suspended", "verification.*required"
-        ]
-        
-        # Medium-risk patterns
-        medium_risk_patterns = [
-            "million", "cash.*award", "immediately", "click.*link",
-            "call.*now", "limited.*time", "exclusive.*offer"
-        ]
-        
-        # Check patterns
-        for pattern in high_risk_patterns:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                score += 8
-                reasons.append(f"High-risk: '{pattern}'")
-        
-        for pattern in medium_risk_patterns:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                score += 4
-                reasons.append(f"Medium-risk: '{pattern}'")
-        
-        # Check scam keywords
-        for keyword in self.database["scam_keywords"]:
-            if keyword in normalized:
-                score += 3
-                reasons.append(f"Keyword: '{keyword}'")
-        
-        # Check for suspicious URLs
-        if re.search(r'http://|https://|www\.|bit\.ly|tinyurl|click.*here', normalized, re.IGNORECASE):
-            score += 6
-            reasons.append("Suspicious URL")
-        
-        # Check for phone number requests
-        if re.search(r'call.*\d|phone.*number|contact.*us|dial.*\d|send.*number', normalized, re.IGNORECASE):
-            score += 5
-            reasons.append("Phone request")
-        
-        # Check for money mentions
-        if re.search(r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money', normalized, re.IGNORECASE):
-            score += 3
-            reasons.append("Money mention")
+        # Every check still runs, since the full score is shown; only the
+        # first three reasons are ever listed, so later ones are not kept
+        for points, reason in self.iter_sms_risks(message):
+            score += points
+            if len(reasons) < 3:
+                reasons.append(reason)
         
         # Determine result
         if score >= 15:
@@ -159,15 +268,41 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
                 "color": "green"
             }
     
+    def cached_check(self, kind, value, check):
+        """Return the JSON-encoded result of check(value), memoized per input"""
+        key = (kind, value)
+        with self._result_cache_lock:
+            payload = self._result_cache.get(key)
+            if payload is not None:
+                self._result_cache.move_to_end(key)
+                return payload
+        
+        # Scan outside the lock so concurrent checks run in parallel
+        result = check(value)
+        print(f"✅ Result: {result['message']}")
+        payload = _json_bytes(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = payload
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return payload
+    
     def do_GET(self):
         """Handle GET requests"""
         if self.path == '/':
             self.send_response(HTTPStatus.OK)
             self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            
-            html_content = self.generate_html_interface()
-            self.wfile.write(html_content.encode())
+            self.send_header('Cache-Control', 'public, max-age=3600')
+            self.send_header('Vary', 'Accept-Encoding')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', _HTML_GZ_LEN)
+                self.end_headers()
+                self.wfile.write(_HTML_GZ)
+            else:
+                self.send_header('Content-Length', _HTML_LEN)
+                self.end_headers()
+                self.wfile.write(_HTML_BYTES)
         
         elif self.path.startswith('/check'):
             # Parse query parameters
@@ -177,28 +312,33 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             code = params.get('code', [''])[0]
             sms = params.get('sms', [''])[0]
             
-            self.send_response(HTTPStatus.OK)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            if code:
-                result = self.check_ussd_code(code)
+            # Reject blank and oversized input before it reaches the scanner
+            status = HTTPStatus.OK
+            if len(code) > MAX_CODE_LENGTH or len(sms) > MAX_SMS_LENGTH:
+                status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                payload = _json_bytes({"error": "Input too long to check"})
+            elif code.strip():
                 print(f"🔍 Checking USSD code: {code}")
-            elif sms:
-                result = self.check_sms_message(sms)
+                payload = self.cached_check('code', code, self.check_ussd_code)
+            elif sms.strip():
                 print(f"🔍 Checking SMS message: {sms[:50]}...")
+                payload = self.cached_check('sms', sms, self.check_sms_message)
             else:
-                result = {"error": "No code or SMS provided"}
+                payload = _json_bytes({"error": "No code or SMS provided"})
             
-            print(f"✅ Result: {result['message']}")
-            self.wfile.write(json.dumps(result).encode())
+            self.send_response(status)
+            self.send_header('Content-type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
         
         else:
             super().do_GET()
-    
-    def generate_html_interface(self):
-        """Generate the enhanced HTML interface with tabs"""
-        return f'''
+
+
+# The enhanced HTML interface with tabs. It is static, so it is a plain
+# literal, encoded once at import.
+_HTML = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -206,39 +346,39 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CyberGuard Security Scanner</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             max-width: 800px;
             margin: 0 auto;
             padding: 20px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
-        }}
-        .container {{
+        }
+        .container {
             background: white;
             border-radius: 15px;
             padding: 30px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 30px;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             color: #333;
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
-        .header p {{
+        }
+        .header p {
             color: #666;
             font-size: 1.2em;
-        }}
-        .tabs {{
+        }
+        .tabs {
             display: flex;
             margin-bottom: 20px;
             border-bottom: 2px solid #eee;
-        }}
-        .tab {{
+        }
+        .tab {
             padding: 12px 24px;
             background: #f8f9fa;
             border: none;
@@ -247,43 +387,43 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             cursor: pointer;
             font-weight: bold;
             transition: all 0.3s;
-        }}
-        .tab.active {{
+        }
+        .tab.active {
             background: #667eea;
             color: white;
-        }}
-        .tab-content {{
+        }
+        .tab-content {
             display: none;
-        }}
-        .tab-content.active {{
+        }
+        .tab-content.active {
             display: block;
-        }}
-        .input-group {{
+        }
+        .input-group {
             margin-bottom: 20px;
-        }}
-        .input-group label {{
+        }
+        .input-group label {
             display: block;
             margin-bottom: 8px;
             font-weight: bold;
             color: #333;
-        }}
-        .input-group input, .input-group textarea {{
+        }
+        .input-group input, .input-group textarea {
             width: 100%;
             padding: 12px;
             border: 2px solid #ddd;
             border-radius: 8px;
             font-size: 16px;
             transition: border-color 0.3s;
-        }}
-        .input-group input:focus, .input-group textarea:focus {{
+        }
+        .input-group input:focus, .input-group textarea:focus {
             border-color: #667eea;
             outline: none;
-        }}
-        .input-group textarea {{
+        }
+        .input-group textarea {
             height: 100px;
             resize: vertical;
-        }}
-        .button {{
+        }
+        .button {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             border: none;
@@ -294,11 +434,11 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             cursor: pointer;
             width: 100%;
             transition: transform 0.2s;
-        }}
-        .button:hover {{
+        }
+        .button:hover {
             transform: translateY(-2px);
-        }}
-        .result {{
+        }
+        .result {
             margin-top: 20px;
             padding: 20px;
             border-radius: 8px;
@@ -309,31 +449,31 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
-        .safe {{ background: #d4edda; color: #155724; border: 2px solid #c3e6cb; }}
-        .warning {{ background: #fff3cd; color: #856404; border: 2px solid #ffeaa7; }}
-        .danger {{ background: #f8d7da; color: #721c24; border: 2px solid #f5c6cb; }}
-        .unknown {{ background: #e2e3e5; color: #383d41; border: 2px solid #d6d8db; }}
-        .examples {{
+        }
+        .safe { background: #d4edda; color: #155724; border: 2px solid #c3e6cb; }
+        .warning { background: #fff3cd; color: #856404; border: 2px solid #ffeaa7; }
+        .danger { background: #f8d7da; color: #721c24; border: 2px solid #f5c6cb; }
+        .unknown { background: #e2e3e5; color: #383d41; border: 2px solid #d6d8db; }
+        .examples {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 8px;
             margin-top: 20px;
-        }}
-        .examples h3 {{
+        }
+        .examples h3 {
             margin-top: 0;
             color: #333;
-        }}
-        .example-item {{
+        }
+        .example-item {
             margin: 5px 0;
             padding: 5px;
             cursor: pointer;
             border-radius: 4px;
             transition: background 0.2s;
-        }}
-        .example-item:hover {{
+        }
+        .example-item:hover {
             background: #e9ecef;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -390,14 +530,14 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
     </div>
 
     <script>
-        function switchTab(tabName) {{
+        function switchTab(tabName) {
             // Hide all tabs
-            document.querySelectorAll('.tab-content').forEach(tab => {{
+            document.querySelectorAll('.tab-content').forEach(tab => {
                 tab.classList.remove('active');
-            }});
-            document.querySelectorAll('.tab').forEach(tab => {{
+            });
+            document.querySelectorAll('.tab').forEach(tab => {
                 tab.classList.remove('active');
-            }});
+            });
             
             // Show selected tab
             document.getElementById(tabName + '-tab').classList.add('active');
@@ -405,64 +545,95 @@ class CyberGuardWebHandler(http.server.SimpleHTTPRequestHandler):
             
             // Update result message
             document.getElementById('result').className = 'result unknown';
-            if (tabName === 'ussd') {{
+            if (tabName === 'ussd') {
                 document.getElementById('result').innerHTML = 'System Ready - Enter a USSD code to check security';
-            }} else {{
+            } else {
                 document.getElementById('result').innerHTML = 'System Ready - Enter an SMS message to check for scams';
-            }}
-        }}
+            }
+        }
 
-        function checkUSSD() {{
+        function checkUSSD() {
             const code = document.getElementById('ussdInput').value.trim();
-            if (!code) {{
+            if (!code) {
                 alert('Please enter a USSD code');
                 return;
-            }}
+            }
             
             fetch('/check?code=' + encodeURIComponent(code))
                 .then(response => response.json())
-                .then(data => {{
+                .then(data => {
                     const result = document.getElementById('result');
                     result.innerHTML = data.message;
                     result.className = 'result ' + getColorClass(data.color);
-                }})
-                .catch(error => {{
+                })
+                .catch(error => {
                     console.error('Error:', error);
                     document.getElementById('result').innerHTML = '❌ Error checking code';
                     document.getElementById('result').className = 'result danger';
-                }});
-        }}
+                });
+        }
 
-        function checkSMS() {{
+        function checkSMS() {
             const sms = document.getElementById('smsInput').value.trim();
-            if (!sms) {{
+            if (!sms) {
                 alert('Please enter an SMS message');
                 return;
-            }}
+            }
             
             fetch('/check?sms=' + encodeURIComponent(sms))
                 .then(response => response.json())
-                .then(data => {{
+                .then(data => {
                     const result = document.getElementById('result');
                     result.innerHTML = data.message.replace(/\\n/g, '<br>');
                     result.className = 'result ' + getColorClass(data.color);
-                }})
-                .catch(error => {{
+                })
+                .catch(error => {
                     console.error('Error:', error);
                     document.getElementById('result').innerHTML = '❌ Error checking SMS';
                     document.getElementById('result').className = 'result danger';
-                }});
-        }}
+                });
+        }
 
-        function getColorClass(color) {{
-            switch(color) {{
+        function getColorClass(color) {
+            switch(color) {
                 case 'green': return 'safe';
                 case 'orange': return 'warning';
                 case 'red': return 'danger';
                 default: return 'unknown';
-            }}
-        }}
+            }
+        }
     </script>
 </body>
 </html>
 '''
+
+_HTML_BYTES = _HTML.encode('utf-8')
+_HTML_LEN = str(len(_HTML_BYTES))
+_HTML_GZ = gzip.compress(_HTML_BYTES, 9)
+_HTML_GZ_LEN = str(len(_HTML_GZ))
+
+
+def main():
+    port = 8001
+    # Load before serving: BaseHTTPRequestHandler.__init__ handles the whole
+    # request, so a handler cannot load anything it needs for do_GET itself
+    CyberGuardWebHandler.load_database()
+    # Each connection gets its own thread, so a slow client or a long SMS
+    # scan no longer blocks every other request behind it
+    server = http.server.ThreadingHTTPServer(('', port), CyberGuardWebHandler)
+    
+    print("🚀 CyberGuard Security Scanner Started!")
+    print(f"📍 Open your browser and go to: http://localhost:{port}")
+    print("📱 Features: USSD Scanner + SMS Fraud Detection")
+    print("🛑 Press Ctrl+C to stop the server")
+    print("\n" + "="*50)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
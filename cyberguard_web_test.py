@@ -3,17 +3,101 @@
 CyberGuard Web Test Interface
 Full web version that mimics the Android app functionality
 """
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import html
 import json
+import mmap
+import os
 import urllib.parse
 import re
+import threading
+from collections import OrderedDict
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+def _query_param(query, name):
+    """Return the first non-empty value of name in a urlencoded string, or ''"""
+    prefix = name + '='
+    for field in query.split('&'):
+        if field.startswith(prefix) and len(field) > len(prefix):
+            return urllib.parse.unquote_plus(field[len(prefix):])
+    return ''
+
+
+def _json_bytes(obj):
+    """Serialize obj straight to JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data):
+    """Parse JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_json(path):
+    """Parse a JSON file straight from a read-only memory map"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is not None:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+
+# Deletes all whitespace in one pass; replaces strip() + replace(" ", "")
+_NORM_TABLE = str.maketrans('', '', ' \t\r\n')
+
+# Every check ends in one of these fixed outcomes, so they are built (and
+# JSON-encoded) once and checks hand back an index into them
+(RESULT_EMPTY, RESULT_KNOWN_SAFE, RESULT_SUSPICIOUS, RESULT_SCAM,
+ RESULT_SAFE_PREFIX, RESULT_UNKNOWN) = range(6)
+
+RESULTS = (
+    {"safe": False, "confidence": 0, "message": "❌ Please enter a USSD code", "color": "gray"},
+    {"safe": True, "confidence": 95, "message": "✅ Known safe USSD code", "color": "green"},
+    {"safe": False, "confidence": 80, "message": "⚠️ Suspicious pattern detected", "color": "orange"},
+    {"safe": False, "confidence": 90, "message": "🚨 Contains scam keywords!", "color": "red"},
+    {"safe": True, "confidence": 60, "message": "✅ Starts with known safe prefix", "color": "green"},
+    {"safe": False, "confidence": 50, "message": "❓ Unknown code - use caution", "color": "orange"},
+)
+
+RESULT_BYTES = tuple(_json_bytes(result) for result in RESULTS)
 
 class USSDSecurityEngine:
+    CACHE_SIZE = 4096
+    
     def __init__(self):
+        # Results keyed on the raw input; checks are deterministic for a
+        # given database, and real traffic repeats a handful of codes
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Load the same database used by Android app
         try:
-            with open('CyberGuardAndroid/app/src/main/assets/ussd_database.json', 'r') as f:
-                self.database = json.load(f)
+            self.database = _load_json('CyberGuardAndroid/app/src/main/assets/ussd_database.json')
             print("✅ Loaded USSD database successfully")
             print(f"   - Safe codes: {len(self.database['safe_ussd_codes'])}")
             print(f"   - Scam patterns: {len(self.database['scam_keywords'])}")
@@ -26,88 +110,191 @@ class USSDSecurityEngine:
                 "suspicious_patterns": ["*xxx*xxx*xxx*xxx#"],
                 "rules": {"safe_prefixes": ["*123", "*901"]}
             }
+        
+        self._compile_database()
+    
+    def _compile_database(self):
+        """Build the lookup structures used on every check"""
+        self._safe_codes = frozenset(self.database["safe_ussd_codes"])
+        self._safe_prefixes = tuple(self.database.get("rules", {}).get("safe_prefixes", []))
+        
+        # Suspicious patterns are templates where "xxx" stands for any run of
+        # characters and everything else ("*", "#") is literal. They are
+        # unioned into one regex, case-insensitive because codes are
+        # uppercased. RE2 runs the chained ".*" gaps in linear time where
+        # the backtracking re engine can go polynomial, so it is preferred.
+        self._susp_re = None
+        patterns = self.database.get("suspicious_patterns", [])
+        if patterns:
+            pattern = "(?i)" + "|".join(f"(?:{re.escape(p).replace('xxx', '.*')})" for p in patterns)
+            self._susp_re = (re2 or re).compile(pattern)
+        
+        # One automaton over all keywords: a single pass over the code.
+        # Keywords are folded to upper case here, matching _normalize_ussd,
+        # so the normalized code is scanned as-is with no per-check copy.
+        # Without pyahocorasick, one compiled literal alternation keeps the
+        # scan inside the C regex engine instead of a Python loop.
+        self._ac = None
+        self._keyword_re = None
+        keywords = self._scan_keywords(self.database.get("scam_keywords", []))
+        if keywords:
+            if ahocorasick is not None:
+                self._ac = ahocorasick.Automaton()
+                for keyword in keywords:
+                    self._ac.add_word(keyword, keyword)
+                self._ac.make_automaton()
+            else:
+                self._keyword_re = re.compile("|".join(re.escape(k) for k in keywords))
+        
+        # With hyperscan, suspicious patterns (anchored at the start, like
+        # re.match) and keywords share one database, so a code is scanned
+        # once for both. Scratch space is per thread.
+        self._hs_db = None
+        self._hs_local = threading.local()
+        if hyperscan is not None and (patterns or keywords):
+            expressions = [f"^(?:{re.escape(p).replace('xxx', '.*')})".encode() for p in patterns]
+            expressions += [re.escape(k).encode() for k in keywords]
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+            )
+            self._hs_pattern_count = len(patterns)
+    
+    @staticmethod
+    def _scan_keywords(keywords):
+        """Upper-case and dedupe keywords, dropping any that contain another"""
+        # Only whether some keyword occurs matters, so a keyword containing a
+        # shorter one can never change the answer and only grows the scanner
+        kept = []
+        for keyword in sorted({k.upper() for k in keywords}, key=len):
+            if not any(shorter in keyword for shorter in kept):
+                kept.append(keyword)
+        return kept
     
     def check_ussd(self, code):
         """Main security check logic - same as Android app"""
+        return dict(RESULTS[self.check_ussd_index(code)])
+    
+    def check_ussd_index(self, code):
+        """Same check, returning the index of the outcome in RESULTS"""
+        with self._cache_lock:
+            index = self._cache.get(code)
+            if index is not None:
+                self._cache.move_to_end(code)
+                return index
+        
+        index = self._check_ussd_uncached(code)
+        with self._cache_lock:
+            self._cache[code] = index
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return index
+    
+    def _check_ussd_uncached(self, code):
         if not code or not code.strip():
-            return self._create_result(False, 0, "❌ Please enter a USSD code", "gray")
+            return RESULT_EMPTY
         
         normalized = self._normalize_ussd(code)
         
         # 1. Check known safe codes
-        if normalized in self.database["safe_ussd_codes"]:
-            return self._create_result(True, 95, "✅ Known safe USSD code", "green")
-        
-        # 2. Check suspicious patterns
-        if self._has_suspicious_pattern(normalized):
-            return self._create_result(False, 80, "⚠️ Suspicious pattern detected", "orange")
+        if normalized in self._safe_codes:
+            return RESULT_KNOWN_SAFE
         
-        # 3. Check scam keywords
-        if self._contains_scam_keywords(normalized):
-            return self._create_result(False, 90, "🚨 Contains scam keywords!", "red")
+        # 2. Check suspicious patterns, 3. check scam keywords
+        suspicious, scam = self._scan(normalized)
+        if suspicious:
+            return RESULT_SUSPICIOUS
+        if scam:
+            return RESULT_SCAM
         
         # 4. Check safe prefixes
         if self._has_safe_prefix(normalized):
-            return self._create_result(True, 60, "✅ Starts with known safe prefix", "green")
+            return RESULT_SAFE_PREFIX
         
-        return self._create_result(False, 50, "❓ Unknown code - use caution", "orange")
+        return RESULT_UNKNOWN
     
     def _normalize_ussd(self, code):
-        return code.strip().replace(" ", "").upper()
+        return code.translate(_NORM_TABLE).upper()
+    
+    def _scan(self, code):
+        """Return (suspicious, scam) for a normalized code"""
+        if self._hs_db is None:
+            if self._has_suspicious_pattern(code):
+                return True, False
+            return False, self._contains_scam_keywords(code)
+        
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+        hits = [False, False]
+        
+        def on_match(expr_id, start, end, flags, context):
+            hits[expr_id >= self._hs_pattern_count] = True
+        
+        self._hs_db.scan(code.encode(), match_event_handler=on_match, scratch=scratch)
+        return hits[0], hits[1]
     
     def _has_suspicious_pattern(self, code):
-        for pattern in self.database.get("suspicious_patterns", []):
-            regex_pattern = pattern.replace("xxx", ".*")
-            if re.match(regex_pattern, code):
-                return True
-        return False
+        return bool(self._susp_re and self._susp_re.match(code))
     
     def _contains_scam_keywords(self, code):
-        for keyword in self.database.get("scam_keywords", []):
-            if keyword.lower() in code.lower():
-                return True
+        if self._ac is not None:
+            return next(self._ac.iter(code), None) is not None
+        if self._keyword_re is not None:
+            return self._keyword_re.search(code) is not None
         return False
     
     def _has_safe_prefix(self, code):
-        for prefix in self.database.get("rules", {}).get("safe_prefixes", []):
-            if code.startswith(prefix):
-                return True
-        return False
-    
-    def _create_result(self, is_safe, confidence, message, color):
-        return {
-            "safe": is_safe,
-            "confidence": confidence,
-            "message": message,
-            "color": color
-        }
+        return code.startswith(self._safe_prefixes)
 
 # Initialize the security engine
 security_engine = USSDSecurityEngine()
 
-class CyberGuardHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path == '/':
-            self._serve_main_page()
-        elif self.path.startswith('/check?'):
-            self._handle_api_check()
-        elif self.path == '/stats':
-            self._serve_stats()
-        else:
-            self._serve_404()
-    
-    def do_POST(self):
-        if self.path == '/check':
-            self._handle_form_check()
-        else:
-            self._serve_404()
-    
-    def _serve_main_page(self):
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
-        html = """
+# Result page for the form post, split around the user's code. The tail
+# for each outcome is rendered once here.
+_COLOR_CLASS = {
+    'green': 'safe',
+    'orange': 'warning',
+    'red': 'danger',
+    'gray': 'unknown'
+}
+
+FORM_PAGE_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>CyberGuard Result</title>
+            <style>
+                body { font-family: Arial, sans-serif; padding: 40px; text-align: center; }
+                .result { padding: 20px; margin: 20px 0; border-radius: 10px; font-weight: bold; }
+                .safe { background: #d4edda; color: #155724; }
+                .warning { background: #fff3cd; color: #856404; }
+                .danger { background: #f8d7da; color: #721c24; }
+                a { display: inline-block; margin-top: 20px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
+            </style>
+        </head>
+        <body>
+            <h1>CyberGuard Result</h1>
+            <p><strong>USSD Code:</strong> """.encode('utf-8')
+
+FORM_PAGE_TAILS = tuple(f"""</p>
+            <div class="result {_COLOR_CLASS.get(result['color'], 'unknown')}">{result['message']}</div>
+            <p><strong>Confidence:</strong> {result['confidence']}%</p>
+            <a href="/">← Check Another Code</a>
+        </body>
+        </html>
+        """.encode('utf-8') for result in RESULTS)
+
+# Upper bounds on the number of codes and the body size accepted by one
+# /check_batch request
+MAX_BATCH_SIZE = 1000
+MAX_BATCH_BYTES = 64 * 1024
+
+# Static pages, encoded once at import
+MAIN_PAGE_BYTES = """
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -277,87 +464,156 @@ class CyberGuardHandler(BaseHTTPRequestHandler):
             </script>
         </body>
         </html>
-        """
-        self.wfile.write(html.encode())
+        """.encode('utf-8')
+
+# The main page is also written once to an anonymous in-memory file so it
+# can be handed to the socket with os.sendfile, skipping the copy through
+# Python buffers. Platforms without memfd_create fall back to wfile.write.
+_MAIN_PAGE_FD = None
+if hasattr(os, 'sendfile') and hasattr(os, 'memfd_create'):
+    try:
+        _MAIN_PAGE_FD = os.memfd_create('cyberguard-main')
+        os.write(_MAIN_PAGE_FD, MAIN_PAGE_BYTES)
+    except OSError:
+        _MAIN_PAGE_FD = None
+
+NOT_FOUND_BYTES = b'<h1>404 - Not Found</h1><p>The page you requested was not found.</p>'
+
+# The database is fixed once loaded, so /stats is a constant response
+STATS_BYTES = _json_bytes({
+    "safe_codes": len(security_engine.database["safe_ussd_codes"]),
+    "scam_patterns": len(security_engine.database["scam_keywords"]),
+    "database_version": "1.0"
+})
+
+class CyberGuardHandler(BaseHTTPRequestHandler):
+    # Every response carries Content-Length, so connections can be kept alive
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        if self.path == '/':
+            self._serve_main_page()
+        elif self.path.startswith('/check?'):
+            self._handle_api_check()
+        elif self.path == '/stats':
+            self._serve_stats()
+        else:
+            self._serve_404()
+    
+    def do_POST(self):
+        if self.path == '/check':
+            self._handle_form_check()
+        elif self.path == '/check_batch':
+            self._handle_batch_check()
+        else:
+            # The unread request body would be parsed as the next request
+            self.close_connection = True
+            self._serve_404()
+    
+    def _serve_main_page(self):
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(MAIN_PAGE_BYTES)))
+        self.end_headers()
+        
+        offset = 0
+        if _MAIN_PAGE_FD is not None:
+            try:
+                sock = self.connection.fileno()
+                while offset < len(MAIN_PAGE_BYTES):
+                    sent = os.sendfile(sock, _MAIN_PAGE_FD, offset, len(MAIN_PAGE_BYTES) - offset)
+                    if not sent:
+                        break
+                    offset += sent
+            except OSError:
+                pass
+        if offset < len(MAIN_PAGE_BYTES):
+            self.wfile.write(MAIN_PAGE_BYTES[offset:])
     
     def _handle_api_check(self):
-        query = urllib.parse.urlparse(self.path).query
-        params = urllib.parse.parse_qs(query)
-        code = params.get('code', [''])[0]
+        code = _query_param(self.path.partition('?')[2].partition('#')[0], 'code')
         
-        result = security_engine.check_ussd(code)
+        body = RESULT_BYTES[security_engine.check_ussd_index(code)]
         
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _handle_batch_check(self):
+        """Check a JSON array of codes in one request"""
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        
+        codes = None
+        if 0 <= content_length <= MAX_BATCH_BYTES:
+            try:
+                codes = _json_loads(self.rfile.read(content_length))
+            except ValueError:
+                pass
+        else:
+            # The unread request body would be parsed as the next request
+            self.close_connection = True
+        
+        if content_length < 0:
+            body = _json_bytes({"error": "Invalid Content-Length"})
+            self.send_response(400)
+        elif content_length > MAX_BATCH_BYTES:
+            body = _json_bytes({"error": f"Request body larger than {MAX_BATCH_BYTES} bytes"})
+            self.send_response(413)
+        elif not isinstance(codes, list) or len(codes) > MAX_BATCH_SIZE \
+                or not all(isinstance(code, str) for code in codes):
+            body = _json_bytes({"error": f"Expected a JSON array of at most {MAX_BATCH_SIZE} codes"})
+            self.send_response(400)
+        else:
+            # Outcomes are already encoded, so the array is just spliced together
+            body = b'[' + b','.join(RESULT_BYTES[security_engine.check_ussd_index(code)]
+                                    for code in codes) + b']'
+            self.send_response(200)
+        
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(result).encode())
+        self.wfile.write(body)
     
     def _handle_form_check(self):
         content_length = int(self.headers['Content-Length'])
         post_data = self.rfile.read(content_length).decode()
-        params = urllib.parse.parse_qs(post_data)
-        code = params.get('ussd_code', [''])[0]
+        code = _query_param(post_data, 'ussd_code')
         
-        result = security_engine.check_ussd(code)
+        # Only the echoed code varies; everything after it is fixed per outcome
+        body = FORM_PAGE_HEAD + html.escape(code).encode() + \
+            FORM_PAGE_TAILS[security_engine.check_ussd_index(code)]
         
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        
-        color_class = {
-            'green': 'safe',
-            'orange': 'warning', 
-            'red': 'danger',
-            'gray': 'unknown'
-        }.get(result['color'], 'unknown')
-        
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>CyberGuard Result</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; padding: 40px; text-align: center; }}
-                .result {{ padding: 20px; margin: 20px 0; border-radius: 10px; font-weight: bold; }}
-                .safe {{ background: #d4edda; color: #155724; }}
-                .warning {{ background: #fff3cd; color: #856404; }}
-                .danger {{ background: #f8d7da; color: #721c24; }}
-                a {{ display: inline-block; margin-top: 20px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }}
-            </style>
-        </head>
-        <body>
-            <h1>CyberGuard Result</h1>
-            <p><strong>USSD Code:</strong> {code}</p>
-            <div class="result {color_class}">{result['message']}</div>
-            <p><strong>Confidence:</strong> {result['confidence']}%</p>
-            <a href="/">← Check Another Code</a>
-        </body>
-        </html>
-        """
-        self.wfile.write(html.encode())
+        self.wfile.write(body)
     
     def _serve_stats(self):
-        stats = {
-            "safe_codes": len(security_engine.database["safe_ussd_codes"]),
-            "scam_patterns": len(security_engine.database["scam_keywords"]),
-            "database_version": "1.0"
-        }
-        
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(STATS_BYTES)))
         self.end_headers()
-        self.wfile.write(json.dumps(stats).encode())
+        self.wfile.write(STATS_BYTES)
     
     def _serve_404(self):
         self.send_response(404)
         self.send_header('Content-type', 'text/html')
+        self.send_header('Content-Length', str(len(NOT_FOUND_BYTES)))
         self.end_headers()
-        self.wfile.write(b'<h1>404 - Not Found</h1><p>The page you requested was not found.</p>')
+        self.wfile.write(NOT_FOUND_BYTES)
 
 def main():
     port = 8001  # Use different port than your backend
-    server = HTTPServer(('localhost', port), CyberGuardHandler)
+    # One thread per connection, so a slow client cannot stall the others
+    server = ThreadingHTTPServer(('localhost', port), CyberGuardHandler)
     
     print("🚀 CyberGuard Web Test Interface Started!")
     print("📍 Open your browser and go to: http://localhost:8001")
@@ -1,19 +1,69 @@
 #!/usr/bin/env python3
+import gzip
 import http.server
-import socketserver
 import json
 import urllib.parse
-import re
 import os
+import threading
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from detection import HIGH_NAMES, MED_NAMES, SmsChecker, UssdChecker
 
 PORT = 8001
 
+# Per-request logging (checks, results, access lines) costs a stdout write
+# on every hit, so it is off unless CG_DEBUG=1
+DEBUG = os.environ.get("CG_DEBUG") == "1"
+
+# Single-signal SMS heuristics, checked alongside the shared risk tiers
+SMS_CHECKER = SmsChecker({
+    'url': r'http://|https://|www\.|bit\.ly|tinyurl|click.*here',
+    'phone': r'call.*\d|phone.*number|contact.*us|dial.*\d|send.*number',
+    'money': r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money',
+})
+
+# Score and reason for each SMS signal, in the order reasons are reported;
+# keyword hits are reported between the pattern tiers and the heuristics
+_PATTERN_SCORES = ([(name, 8, f"High-risk: '{p}'") for name, p in HIGH_NAMES.items()] +
+                   [(name, 4, f"Medium-risk: '{p}'") for name, p in MED_NAMES.items()])
+_HEURISTIC_SCORES = [('url', 6, "Suspicious URL"), ('phone', 5, "Phone request"), ('money', 3, "Money mention")]
+
+
+def _json_bytes(obj):
+    """Serialize obj straight to JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+NO_INPUT_RESPONSE = _json_bytes({"error": "No code or SMS provided"})
+
+
 class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        self.database = self.load_database()
-        super().__init__(*args, **kwargs)
+    # JSON-encoded check results keyed on (kind, input). A new handler is
+    # created per request, so the cache lives on the class, guarded by a lock.
+    RESULT_CACHE_SIZE = 4096
+    _result_cache = OrderedDict()
+    _result_cache_lock = threading.Lock()
+    
+    # The database and the checker compiled from it are shared the same way;
+    # init_database fills them in once, before the server starts
+    database = {"safe_codes": [], "scam_patterns": [], "scam_keywords": []}
+    ussd_checker = UssdChecker(database)
     
-    def load_database(self):
+    @classmethod
+    def init_database(cls):
+        """Load the USSD database and build its lookup tables"""
+        cls.database = cls.load_database()
+        cls.ussd_checker = UssdChecker(cls.database)
+    
+    @staticmethod
+    def load_database():
         """Load the USSD database"""
         try:
             database_path = 'CyberGuardAndroid/app/src/main/assets/ussd_database.json'
@@ -43,12 +93,18 @@ class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
     
     def serve_html(self):
         """Serve the main HTML interface"""
-        html_content = self.generate_html_interface()
         self.send_response(200)
         self.send_header('Content-type', 'text/html')
-        self.send_header('Content-Length', str(len(html_content)))
-        self.end_headers()
-        self.wfile.write(html_content.encode())
+        self.send_header('Vary', 'Accept-Encoding')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', _HTML_GZ_LEN)
+            self.end_headers()
+            self.wfile.write(_HTML_GZ)
+        else:
+            self.send_header('Content-Length', _HTML_LEN)
+            self.end_headers()
+            self.wfile.write(_HTML_BYTES)
     
     def handle_check(self):
         """Handle security check requests"""
@@ -60,59 +116,67 @@ class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
         sms = params.get('sms', [''])[0]
         
         if code:
-            result = self.check_ussd_code(code)
-            print(f"🔍 Checking USSD code: {code}")
+            if DEBUG:
+                print(f"🔍 Checking USSD code: {code}")
+            response = self.cached_check('code', code, self.check_ussd_code)
         elif sms:
-            result = self.check_sms_message(sms)
-            print(f"🔍 Checking SMS message: {sms[:50]}...")
+            if DEBUG:
+                print(f"🔍 Checking SMS message: {sms[:50]}...")
+            response = self.cached_check('sms', sms, self.check_sms_message)
         else:
-            result = {"error": "No code or SMS provided"}
-        
-        print(f"✅ Result: {result['message']}")
+            response = NO_INPUT_RESPONSE
         
         # Send JSON response
-        response = json.dumps(result).encode()
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
         self.send_header('Content-Length', str(len(response)))
         self.end_headers()
         self.wfile.write(response)
     
+    def cached_check(self, kind, value, check):
+        """Return the JSON-encoded result of check(value), memoized per input"""
+        key = (kind, value)
+        with self._result_cache_lock:
+            response = self._result_cache.get(key)
+            if response is not None:
+                self._result_cache.move_to_end(key)
+                return response
+        
+        result = check(value)
+        if DEBUG:
+            print(f"✅ Result: {result['message']}")
+        response = _json_bytes(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = response
+            if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+        return response
+    
     def check_ussd_code(self, code):
         """Check USSD code security"""
-        normalized = code.lower().strip()
+        verdict, detail = self.ussd_checker.check(code)
         
-        # Check safe codes
-        for safe_code in self.database["safe_codes"]:
-            if safe_code["code"].lower() == normalized:
-                return {
-                    "safe": True,
-                    "confidence": 95,
-                    "message": f"✅ SAFE - {safe_code['description']}",
-                    "color": "green"
-                }
-        
-        # Check scam patterns
-        for pattern in self.database["scam_patterns"]:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                return {
-                    "safe": False,
-                    "confidence": 90,
-                    "message": f"🚨 SCAM - Matches scam pattern: '{pattern}'",
-                    "color": "red"
-                }
+        if verdict == "safe":
+            return {
+                "safe": True,
+                "confidence": 95,
+                "message": f"✅ SAFE - {detail}",
+                "color": "green"
+            }
         
-        # Check scam keywords
-        found_keywords = []
-        for keyword in self.database["scam_keywords"]:
-            if keyword in normalized:
-                found_keywords.append(keyword)
+        if verdict == "scam":
+            return {
+                "safe": False,
+                "confidence": 90,
+                "message": f"🚨 SCAM - Matches scam pattern: '{detail}'",
+                "color": "red"
+            }
         
-        if found_keywords:
+        if verdict == "suspicious":
             return {
                 "safe": False,
                 "confidence": 75,
-                "message": f"⚠️ SUSPICIOUS - Contains scam keywords: {', '.join(found_keywords)}",
+                "message": f"⚠️ SUSPICIOUS - Contains scam keywords: {', '.join(detail)}",
                 "color": "orange"
             }
         
@@ -137,51 +201,24 @@ class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
         score = 0
         reasons = []
         
-        # High-risk patterns
-        high_risk_patterns = [
-            "won.*prize", "win.*lottery", "congratulations.*won", 
-            "claim.*prize", "free.*gift", "urgent.*account",
-            "bvn.*required", "password.*reset", "pin.*verification",
-            "account.*suspended", "verification.*required"
-        ]
-        
-        # Medium-risk patterns
-        medium_risk_patterns = [
-            "million", "cash.*award", "immediately", "click.*link",
-            "call.*now", "limited.*time", "exclusive.*offer"
-        ]
+        signals = SMS_CHECKER.signals(normalized)
         
         # Check patterns
-        for pattern in high_risk_patterns:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                score += 8
-                reasons.append(f"High-risk: '{pattern}'")
-        
-        for pattern in medium_risk_patterns:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                score += 4
-                reasons.append(f"Medium-risk: '{pattern}'")
+        for name, weight, reason in _PATTERN_SCORES:
+            if name in signals:
+                score += weight
+                reasons.append(reason)
         
         # Check scam keywords
-        for keyword in self.database["scam_keywords"]:
-            if keyword in normalized:
-                score += 3
-                reasons.append(f"Keyword: '{keyword}'")
-        
-        # Check for suspicious URLs
-        if re.search(r'http://|https://|www\.|bit\.ly|tinyurl|click.*here', normalized, re.IGNORECASE):
-            score += 6
-            reasons.append("Suspicious URL")
-        
-        # Check for phone number requests
-        if re.search(r'call.*\d|phone.*number|contact.*us|dial.*\d|send.*number', normalized, re.IGNORECASE):
-            score += 5
-            reasons.append("Phone request")
-        
-        # Check for money mentions
-        if re.search(r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money', normalized, re.IGNORECASE):
+        for keyword in self.ussd_checker.find_scam_keywords(normalized):
             score += 3
-            reasons.append("Money mention")
+            reasons.append(f"Keyword: '{keyword}'")
+        
+        # Check for suspicious URLs, phone number requests and money mentions
+        for name, weight, reason in _HEURISTIC_SCORES:
+            if name in signals:
+                score += weight
+                reasons.append(reason)
         
         # Determine result
         if score >= 15:
@@ -213,9 +250,14 @@ class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
                 "color": "green"
             }
     
-    def generate_html_interface(self):
-        """Generate the enhanced HTML interface with tabs"""
-        return '''<!DOCTYPE html>
+    def log_message(self, format, *args):
+        """Override to show custom log format"""
+        if DEBUG:
+            print(f"🌐 {format % args}")
+
+# The enhanced HTML interface with tabs. It is static, so it is a plain
+# literal, encoded (and gzipped) once at import.
+_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -346,10 +388,13 @@ class CyberGuardHandler(http.server.BaseHTTPRequestHandler):
     </script>
 </body>
 </html>'''
-    
-    def log_message(self, format, *args):
-        """Override to show custom log format"""
-        print(f"🌐 {format % args}")
+
+_HTML_BYTES = _HTML.encode('utf-8')
+_HTML_LEN = str(len(_HTML_BYTES))
+_HTML_GZ = gzip.compress(_HTML_BYTES, 9)
+_HTML_GZ_LEN = str(len(_HTML_GZ))
+
+CyberGuardHandler.init_database()
 
 print(f"🚀 Starting CyberGuard Web Interface...")
 print(f"📍 Open: http://localhost:{PORT}")
@@ -357,7 +402,9 @@ print(f"📱 Features: USSD Scanner + SMS Fraud Detection")
 print(f"🛑 Press Ctrl+C to stop the server")
 print("=" * 50)
 
-with socketserver.TCPServer(("", PORT), CyberGuardHandler) as httpd:
+# One thread per connection, so a slow client cannot stall the others.
+# ThreadingHTTPServer already reuses the address and uses daemon threads.
+with http.server.ThreadingHTTPServer(("", PORT), CyberGuardHandler) as httpd:
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Shared USSD/SMS detection - patterns and lookup tables compiled once
+"""
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# SMS risk patterns, fused into one alternation each so a message is scanned
+# once per tier. Every alternative is a zero-width lookahead, so overlapping
+# hits (e.g. "won ... prize" and "claim ... prize") are all still reported.
+# Messages are lowercased before matching, so no pattern needs IGNORECASE.
+HIGH_RISK_PATTERNS = (
+    "won.*prize", "win.*lottery", "congratulations.*won",
+    "claim.*prize", "free.*gift", "urgent.*account",
+    "bvn.*required", "password.*reset", "pin.*verification",
+    "account.*suspended", "verification.*required"
+)
+
+MEDIUM_RISK_PATTERNS = (
+    "million", "cash.*award", "immediately", "click.*link",
+    "call.*now", "limited.*time", "exclusive.*offer"
+)
+
+HIGH_RE = re.compile('|'.join(f'(?=(?P<h{i}>{p}))' for i, p in enumerate(HIGH_RISK_PATTERNS)))
+HIGH_NAMES = {f'h{i}': p for i, p in enumerate(HIGH_RISK_PATTERNS)}
+
+MED_RE = re.compile('|'.join(f'(?=(?P<m{i}>{p}))' for i, p in enumerate(MEDIUM_RISK_PATTERNS)))
+MED_NAMES = {f'm{i}': p for i, p in enumerate(MEDIUM_RISK_PATTERNS)}
+
+# RE2 reads \d, \s, \w and \b as ASCII-only and $ as the end of the text, so
+# signals spelled with them stay on re to keep their meaning
+_RE2_UNSAFE = re.compile(r'\\[dDsSwWbBZ]|(?<!\\)\$')
+
+
+class UssdChecker:
+    """Safe-code, scam-pattern and scam-keyword checks over one USSD database"""
+
+    def __init__(self, database):
+        self.database = database
+
+        # Codes are lowercased before matching, so only patterns that spell
+        # out upper-case letters (or escapes such as \W) keep IGNORECASE
+        self.scam_pattern_res = [(p, re.compile(p, 0 if p == p.lower() else re.IGNORECASE))
+                                 for p in database["scam_patterns"]]
+
+        # Safe code descriptions keyed by lowercased code, so a check is one
+        # probe; the first entry wins, as in a scan
+        self.safe_descriptions = {}
+        for entry in database["safe_codes"]:
+            self.safe_descriptions.setdefault(entry["code"].lower(), entry["description"])
+
+        # One automaton over every keyword: a single pass finds all hits
+        self.ac = None
+        if ahocorasick is not None and database["scam_keywords"]:
+            self.ac = ahocorasick.Automaton()
+            for keyword in database["scam_keywords"]:
+                self.ac.add_word(keyword, keyword)
+            self.ac.make_automaton()
+
+        # A plain *NNN# code can only contain keywords spelled with digits,
+        # '*' and '#'; without any, check skips the keyword scan for it
+        self.digit_keywords = any(set(keyword) <= set('0123456789*#')
+                                  for keyword in database["scam_keywords"])
+
+    def find_scam_keywords(self, normalized):
+        """Return the scam keywords contained in normalized, in database order"""
+        if self.ac is not None:
+            hits = {keyword for _, keyword in self.ac.iter(normalized)}
+        else:
+            hits = {keyword for keyword in self.database["scam_keywords"] if keyword in normalized}
+        return [keyword for keyword in self.database["scam_keywords"] if keyword in hits]
+
+    def check(self, code):
+        """Classify code as ('safe', description), ('scam', pattern), ('suspicious', keywords) or ('unknown', None)"""
+        # The common plain *NNN# shape is already normalized
+        plain = (len(code) == 5 and code[0] == '*' and code[4] == '#'
+                 and code[1:4].isascii() and code[1:4].isdigit())
+        normalized = code if plain else code.lower().strip()
+
+        # Check safe codes
+        description = self.safe_descriptions.get(normalized)
+        if description is not None:
+            return "safe", description
+
+        # Check scam patterns
+        for pattern, regex in self.scam_pattern_res:
+            if regex.search(normalized):
+                return "scam", pattern
+
+        # Check scam keywords
+        if not plain or self.digit_keywords:
+            found_keywords = self.find_scam_keywords(normalized)
+            if found_keywords:
+                return "suspicious", found_keywords
+
+        return "unknown", None
+
+
+class SmsChecker:
+    """Finds SMS risk signals: the high/medium tiers plus caller-named heuristics"""
+
+    def __init__(self, heuristics):
+        self.heuristic_res = [(name, re.compile(pattern)) for name, pattern in heuristics.items()]
+
+        # With RE2, every signal it reads the same way as re goes into one
+        # set, which finds all of them in a single linear-time pass; the
+        # rest are still searched one by one with re
+        self._re2_set = None
+        self._re2_names = []
+        self._re_only = []
+        if re2 is not None:
+            self._re2_set = re2.Set.SearchSet()
+            for name, pattern in [*HIGH_NAMES.items(), *MED_NAMES.items(), *heuristics.items()]:
+                if not _RE2_UNSAFE.search(pattern):
+                    try:
+                        self._re2_set.Add(pattern)
+                        self._re2_names.append(name)
+                        continue
+                    except re2.error:
+                        pass
+                self._re_only.append((name, re.compile(pattern)))
+            self._re2_set.Compile()
+
+    def signals(self, text):
+        """Return the names of every signal (h0.., m0.., heuristics) found in lowercased text"""
+        if self._re2_set is not None:
+            try:
+                hits = self._re2_set.Match(text) or ()
+            except UnicodeEncodeError:
+                # RE2 scans UTF-8, which lone surrogates have no encoding in
+                hits = None
+            if hits is not None:
+                signals = {self._re2_names[i] for i in hits}
+                for name, regex in self._re_only:
+                    if regex.search(text):
+                        signals.add(name)
+                return signals
+
+        signals = {m.lastgroup for m in HIGH_RE.finditer(text)}
+        signals.update(m.lastgroup for m in MED_RE.finditer(text))
+        for name, regex in self.heuristic_res:
+            if regex.search(text):
+                signals.add(name)
+        return signals
@@ -5,6 +5,20 @@ Intelligent USSD Detection - Prevents false positives for legitimate code change
 import re
 import json
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def _fast_simple_ussd(code):
+    """True if code is plainly *NNN#, *NNN*N# or *NNN*N*N# in ASCII digits, else None"""
+    if code[:1] != '*' or code[-1:] != '#' or not code.isascii():
+        return None
+    groups = code[1:-1].split('*')
+    if len(groups) <= 3 and len(groups[0]) == 3 and all(group.isdigit() for group in groups):
+        return True
+    return None
+
 class IntelligentDetector:
     def __init__(self):
         self.trusted_patterns = [
@@ -35,31 +49,61 @@ class IntelligentDetector:
             r'^\*\d{3}\*\d+#$',               # *123*1#
             r'^\*\d{3}\*\d+\*\d+#$',          # *123*1*1#
         ]
+        
+        # Any structure will do, so they are checked as one alternation
+        self._structure_re = re.compile('|'.join(f'(?:{p})' for p in self.legitimate_structures))
+        
+        # Trusted patterns bucketed by the literal digit after the leading
+        # "*", so a code is only tried against patterns that can match it
+        self._trusted_by_digit = {}
+        self._trusted_other = []
+        for pattern in self.trusted_patterns:
+            lead = re.match(r'\^\\\*(\d)', pattern)
+            if lead:
+                self._trusted_by_digit.setdefault(lead.group(1), []).append(re.compile(pattern))
+            else:
+                self._trusted_other.append(re.compile(pattern))
+        
+        self.scam_indicators = [
+            'password', 'pin', 'bvn', 'winner', 'won', 'prize', 
+            'lottery', 'claim', 'free', 'gift', 'urgent', 'verification',
+            'suspended', 'reset', 'confirm', 'update', 'security'
+        ]
+        
+        # One automaton over every indicator, or one fused regex without
+        # pyahocorasick: either way a single pass that stops at the first hit
+        self._scam_ac = None
+        self._scam_re = None
+        if ahocorasick is not None:
+            self._scam_ac = ahocorasick.Automaton()
+            for keyword in self.scam_indicators:
+                self._scam_ac.add_word(keyword, keyword)
+            self._scam_ac.make_automaton()
+        else:
+            self._scam_re = re.compile('|'.join(map(re.escape, self.scam_indicators)))
     
     def is_trusted_structure(self, code):
         """Check if code follows legitimate USSD structure patterns"""
-        for pattern in self.legitimate_structures:
-            if re.match(pattern, code):
-                return True
-        return False
+        # Plain ASCII codes are settled with string methods; anything the
+        # fast path cannot vouch for goes through the regex
+        if _fast_simple_ussd(code):
+            return True
+        return self._structure_re.match(code) is not None
     
     def is_trusted_pattern(self, code):
         """Check if code matches known trusted service patterns"""
-        for pattern in self.trusted_patterns:
-            if re.match(pattern, code):
-                return True
-        return False
+        if code[:1] == '*':
+            for regex in self._trusted_by_digit.get(code[1:2], ()):
+                if regex.match(code):
+                    return True
+        return any(regex.match(code) for regex in self._trusted_other)
     
     def contains_scam_keywords(self, code):
         """Check for obvious scam indicators"""
-        scam_indicators = [
-            'password', 'pin', 'bvn', 'winner', 'won', 'prize', 
-            'lottery', 'claim', 'free', 'gift', 'urgent', 'verification',
-            'suspended', 'reset', 'confirm', 'update', 'security'
-        ]
-        
         code_lower = code.lower()
-        return any(keyword in code_lower for keyword in scam_indicators)
+        if self._scam_ac is not None:
+            return next(self._scam_ac.iter(code_lower), None) is not None
+        return self._scam_re.search(code_lower) is not None
     
     def analyze_ussd_code(self, code):
         """
@@ -1,17 +1,36 @@
 #!/usr/bin/env python3
 import json
-import re
+import sys
+
+from detection import HIGH_NAMES, MED_NAMES, SmsChecker, UssdChecker
+
+# URL and phone-request heuristics, checked alongside the shared risk tiers
+SMS_CHECKER = SmsChecker({
+    'url': r'http://|https://|www\.|bit\.ly|tinyurl',
+    'phone': r'call.*\d|phone.*number|contact.*us|dial.*\d',
+})
+
+# Score and reason for each SMS signal, in the order reasons are reported
+_SMS_SCORES = ([(name, 8, f"High-risk pattern: '{p}'") for name, p in HIGH_NAMES.items()] +
+               [(name, 4, f"Medium-risk pattern: '{p}'") for name, p in MED_NAMES.items()] +
+               [('url', 6, "Contains suspicious URL"), ('phone', 5, "Requests phone contact")])
+
 
 class CyberGuardTester:
     def __init__(self):
         with open('CyberGuardAndroid/app/src/main/assets/ussd_database.json', 'r') as f:
             self.db = json.load(f)
+        self.ussd_checker = UssdChecker(self.db)
     
     def test_ussd_interactive(self):
         print("\n" + "="*50)
         print("📟 USSD CODE TESTING INTERFACE")
         print("="*50)
         
+        if not sys.stdin.isatty():
+            self.run_batch(self.analyze_ussd)
+            return
+        
         while True:
             code = input("\nEnter USSD code to test (or 'quit'): ").strip()
             if code.lower() == 'quit':
@@ -25,6 +44,10 @@ class CyberGuardTester:
         print("💬 SMS MESSAGE TESTING INTERFACE")  
         print("="*50)
         
+        if not sys.stdin.isatty():
+            self.run_batch(self.analyze_sms)
+            return
+        
         while True:
             message = input("\nEnter SMS message to test (or 'quit'): ").strip()
             if message.lower() == 'quit':
@@ -33,27 +56,28 @@ class CyberGuardTester:
             result = self.analyze_sms(message)
             print(f"\n🔍 ANALYSIS RESULT: {result}")
     
+    def run_batch(self, analyze):
+        """Analyze piped input lines up to 'quit' or EOF, writing all results at once"""
+        out = []
+        for line in sys.stdin:
+            item = line.strip()
+            if item.lower() == 'quit':
+                break
+            out.append(f"\n🔍 ANALYSIS RESULT: {analyze(item)}\n")
+        sys.stdout.write(''.join(out))
+        sys.stdout.flush()
+    
     def analyze_ussd(self, code):
-        normalized = code.lower().strip()
-        
-        # Check safe codes
-        for safe_code in self.db["safe_codes"]:
-            if safe_code["code"].lower() == normalized:
-                return f"✅ SAFE - {safe_code['description']}"
+        verdict, detail = self.ussd_checker.check(code)
         
-        # Check scam patterns
-        for pattern in self.db["scam_patterns"]:
-            if re.search(pattern, normalized, re.IGNORECASE):
-                return f"🚨 SCAM - Matches known scam pattern: '{pattern}'"
+        if verdict == "safe":
+            return f"✅ SAFE - {detail}"
         
-        # Check scam keywords
-        found_keywords = []
-        for keyword in self.db["scam_keywords"]:
-            if keyword in normalized:
-                found_keywords.append(keyword)
+        if verdict == "scam":
+            return f"🚨 SCAM - Matches known scam pattern: '{detail}'"
         
-        if found_keywords:
-            return f"⚠️ SUSPICIOUS - Contains scam keywords: {', '.join(found_keywords)}"
+        if verdict == "suspicious":
+            return f"⚠️ SUSPICIOUS - Contains scam keywords: {', '.join(detail)}"
         
         return "❓ UNKNOWN - Code not in database. Use with caution."
     
@@ -62,40 +86,13 @@ class CyberGuardTester:
         score = 0
         reasons = []
         
-        # High-risk patterns
-        high_risk_patterns = [
-            "won.*prize", "win.*lottery", "congratulations.*won", 
-            "claim.*prize", "free.*gift", "urgent.*account",
-            "bvn.*required", "password.*reset", "pin.*verification",
-            "account.*suspended", "verification.*required"
-        ]
-        
-        # Medium-risk patterns
-        medium_risk_patterns = [
-            "million", "cash.*award", "immediately", "click.*link",
-            "call.*now", "limited.*time", "exclusive.*offer"
-        ]
+        signals = SMS_CHECKER.signals(normalized)
         
-        # Check patterns
-        for pattern in high_risk_patterns:
-            if re.search(pattern, normalized):
-                score += 8
-                reasons.append(f"High-risk pattern: '{pattern}'")
-        
-        for pattern in medium_risk_patterns:
-            if re.search(pattern, normalized):
-                score += 4
-                reasons.append(f"Medium-risk pattern: '{pattern}'")
-        
-        # Check for URLs
-        if re.search(r'http://|https://|www\.|bit\.ly|tinyurl', normalized):
-            score += 6
-            reasons.append("Contains suspicious URL")
-        
-        # Check for phone requests
-        if re.search(r'call.*\d|phone.*number|contact.*us|dial.*\d', normalized):
-            score += 5
-            reasons.append("Requests phone contact")
+        # Check patterns, URLs and phone requests
+        for name, weight, reason in _SMS_SCORES:
+            if name in signals:
+                score += weight
+                reasons.append(reason)
         
         # Determine result
         if score >= 15:
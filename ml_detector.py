@@ -6,61 +6,224 @@ AI-powered legitimate pattern recognition
 import re
 import json
 import logging
+import threading
+from datetime import datetime
 from pathlib import Path
-from collections import Counter
+from collections import Counter, deque
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 import joblib
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    convert_sklearn = None
+
 logger = logging.getLogger("cyberguard")
 
+# Feature patterns, compiled once rather than on every extract_features call
+_BANK_RE = re.compile(r'^\*9[0-9]{2}#$')
+_TELCO_RE = re.compile(r'^\*[0-9]{3}#$')
+_SERVICE_RE = re.compile(r'^\*#[0-9]{2}#$')
+_DIGIT_RE = re.compile(r'\d')
+
+_ASCII_DIGITS = b'0123456789'
+
+RISKY_KEYWORDS = ('bvn', 'pin', 'password', 'verify', 'otp', 'account')
+SAFE_KEYWORDS = ('balance', 'transfer', 'airtime', 'data', 'minutes')
+
+# Feature order, as fed to the model
+FEATURE_NAMES = ('length', 'digit_count', 'star_count', 'hash_count',
+                 'has_bank_pattern', 'has_telco_pattern', 'has_service_pattern',
+                 'risky_keyword_count', 'safe_keyword_count')
+
+# Feedback records kept for retraining; the file may grow to twice this
+# before it is cut back, so the rewrite is amortized over many appends
+TRAINING_DATA_LIMIT = 1000
+
+# Arrays the forest is flattened into: every tree's nodes laid end to end
+FOREST_ARRAYS = ('roots', 'feature', 'threshold', 'left', 'right', 'value', 'classes')
+
+def _json_loads(data):
+    """Parse JSON bytes, via orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_line(record):
+    """Serialize record as one JSONL line of bytes"""
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record).encode() + b'\n'
+
 class MLPatternDetector:
     def __init__(self):
         self.model_file = Path("data/ml_model.joblib")
         self.vectorizer_file = Path("data/vectorizer.joblib")
-        self.training_data_file = Path("data/training_data.json")
+        self.training_data_file = Path("data/training_data.jsonl")
+        self.legacy_training_data_file = Path("data/training_data.json")
+        self.training_record_count = None
+        self._training_lock = threading.Lock()
+        self.onnx_file = Path("data/ml_model.onnx")
+        self.forest_dir = Path("data/ml_forest")
         self.model = None
         self.vectorizer = None
+        self.session = None
+        self.forest = None
         self.load_model()
     
+    def start_warmup(self):
+        """Make the first predictions on a background thread, off the request path"""
+        # The first prediction through a backend pays one-off setup costs
+        # (ONNX Runtime allocations above all). Servers call this once at
+        # startup; importing the module starts no thread.
+        threading.Thread(target=self._warmup, daemon=True).start()
+    
+    def _warmup(self):
+        """Run throwaway predictions through the fast and general feature paths"""
+        for code in ("*123#", "*123*bvn*1#"):
+            self.predict_legitimate(code)
+    
     def load_model(self):
         """Load trained ML model"""
         try:
-            if self.model_file.exists() and self.vectorizer_file.exists():
-                self.model = joblib.load(self.model_file)
-                self.vectorizer = joblib.load(self.vectorizer_file)
+            if self.model_file.exists():
+                # The flat forest arrays memory-map in place of unpickling
+                # every tree; the pickle is only read when they are missing
+                if not self.load_forest():
+                    self.model = joblib.load(self.model_file)
+                # No vectorizer is saved with the model; load one if present
+                if self.vectorizer_file.exists():
+                    self.vectorizer = joblib.load(self.vectorizer_file)
                 logger.info("ML model loaded successfully")
             else:
                 self.train_initial_model()
         except Exception as e:
             logger.warning(f"Failed to load ML model: {e}")
             self.train_initial_model()
+        self.load_session()
+    
+    def load_forest(self):
+        """Memory-map the flat forest arrays saved with the model, if present"""
+        self.forest = None
+        if not all((self.forest_dir / f"{name}.npy").exists() for name in FOREST_ARRAYS):
+            return False
+        self.forest = {name: np.load(self.forest_dir / f"{name}.npy", mmap_mode='r') for name in FOREST_ARRAYS}
+        return True
+    
+    def save_forest(self):
+        """Flatten the trained forest into one set of node arrays for load_forest"""
+        roots, feature, threshold, left, right, value = [], [], [], [], [], []
+        offset = 0
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            roots.append(offset)
+            feature.append(tree.feature)
+            threshold.append(tree.threshold)
+            # Child indices become global; leaves keep -1
+            left.append(np.where(tree.children_left == -1, -1, tree.children_left + offset))
+            right.append(np.where(tree.children_right == -1, -1, tree.children_right + offset))
+            # Per-node class probabilities, as each tree's predict_proba gives
+            counts = tree.value[:, 0, :]
+            value.append(counts / counts.sum(axis=1, keepdims=True))
+            offset += tree.node_count
+        
+        self.forest_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            'roots': np.array(roots, dtype=np.intp),
+            'feature': np.concatenate(feature).astype(np.intp),
+            'threshold': np.concatenate(threshold),
+            'left': np.concatenate(left).astype(np.intp),
+            'right': np.concatenate(right).astype(np.intp),
+            'value': np.concatenate(value),
+            'classes': self.model.classes_,
+        }
+        for name in FOREST_ARRAYS:
+            np.save(self.forest_dir / f"{name}.npy", arrays[name])
+    
+    def forest_proba(self, feature_matrix):
+        """Class probabilities from the flat forest arrays, walking every tree at once"""
+        forest = self.forest
+        rows = np.arange(len(feature_matrix))[:, None]
+        nodes = np.tile(forest['roots'], (len(feature_matrix), 1))
+        while True:
+            left = forest['left'][nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = feature_matrix[rows, forest['feature'][nodes]] <= forest['threshold'][nodes]
+            nodes = np.where(internal, np.where(go_left, left, forest['right'][nodes]), nodes)
+        return forest['value'][nodes].mean(axis=1)
+    
+    def load_session(self):
+        """Open an ONNX Runtime session over the saved model, when available"""
+        self.session = None
+        if onnxruntime is None or not self.onnx_file.exists():
+            return
+        try:
+            self.session = onnxruntime.InferenceSession(str(self.onnx_file), providers=['CPUExecutionProvider'])
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model: {e}")
     
     def extract_features(self, text):
         """Extract features from text for ML analysis"""
-        features = {}
-        
-        # Structural features
-        features['length'] = len(text)
-        features['digit_count'] = len(re.findall(r'\d', text))
-        features['star_count'] = text.count('*')
-        features['hash_count'] = text.count('#')
-        
-        # Pattern features
-        features['has_bank_pattern'] = bool(re.match(r'^\*9[0-9]{2}#$', text))
-        features['has_telco_pattern'] = bool(re.match(r'^\*[0-9]{3}#$', text))
-        features['has_service_pattern'] = bool(re.match(r'^\*#[0-9]{2}#$', text))
+        return dict(zip(FEATURE_NAMES, self.feature_values(text)))
+    
+    def feature_values(self, text):
+        """Feature values for text in FEATURE_NAMES order, without building a dict"""
+        # The common five-character shapes fold to constants: a plain *NNN#
+        # or *#NN# code has fixed counts and no room for a keyword
+        if len(text) == 5 and text[0] == '*' and text[4] == '#' and text.isascii():
+            if text[1:4].isdigit():
+                return [5, 3, 1, 1, text[1] == '9', True, False, 0, 0]
+            if text[1] == '#' and text[2:4].isdigit():
+                return [5, 2, 1, 2, False, False, True, 0, 0]
         
-        # Keyword features
-        risky_keywords = ['bvn', 'pin', 'password', 'verify', 'otp', 'account']
-        safe_keywords = ['balance', 'transfer', 'airtime', 'data', 'minutes']
+        has_letters = True
+        if text.isascii():
+            # Deleting the digits from the ASCII bytes is one C pass with no
+            # per-character table lookups; the length difference counts them
+            raw = text.encode('ascii')
+            non_digits = raw.translate(None, _ASCII_DIGITS)
+            digit_count = len(raw) - len(non_digits)
+            # Every keyword is letters, so a code of only digits, '*' and '#'
+            # needs no keyword scan
+            has_letters = bool(non_digits.translate(None, b'*#'))
+        else:
+            digit_count = len(_DIGIT_RE.findall(text))
         
-        text_lower = text.lower()
-        features['risky_keyword_count'] = sum(1 for kw in risky_keywords if kw in text_lower)
-        features['safe_keyword_count'] = sum(1 for kw in safe_keywords if kw in text_lower)
+        risky_count = safe_count = 0
+        if has_letters:
+            contains = text.lower().__contains__
+            risky_count = sum(map(contains, RISKY_KEYWORDS))
+            safe_count = sum(map(contains, SAFE_KEYWORDS))
         
-        return features
+        return [
+            # Structural features
+            len(text),
+            digit_count,
+            text.count('*'),
+            text.count('#'),
+            # Pattern features
+            bool(_BANK_RE.match(text)),
+            bool(_TELCO_RE.match(text)),
+            bool(_SERVICE_RE.match(text)),
+            # Keyword features
+            risky_count,
+            safe_count,
+        ]
     
     def train_initial_model(self):
         """Train initial ML model with sample data"""
@@ -80,7 +243,7 @@ class MLPatternDetector:
         texts, labels = zip(*training_data)
         
         # Extract features
-        features = [list(self.extract_features(text).values()) for text in texts]
+        features = [self.feature_values(text) for text in texts]
         
         # Train model
         from sklearn.ensemble import RandomForestClassifier
@@ -96,62 +259,130 @@ class MLPatternDetector:
         try:
             self.model_file.parent.mkdir(exist_ok=True)
             joblib.dump(self.model, self.model_file)
+            self.save_forest()
             logger.info("ML model saved successfully")
+            
+            # An ONNX copy lets predictions skip sklearn's per-call overhead;
+            # a stale copy from an earlier model must not outlive it
+            self.onnx_file.unlink(missing_ok=True)
+            if convert_sklearn is not None:
+                onx = convert_sklearn(self.model,
+                                      initial_types=[('X', FloatTensorType([None, len(FEATURE_NAMES)]))],
+                                      options={id(self.model): {'zipmap': False}})
+                self.onnx_file.write_bytes(onx.SerializeToString())
         except Exception as e:
             logger.error(f"Failed to save ML model: {e}")
     
+    def score(self, feature_matrix):
+        """
+        Score an (N, 9) float32 feature matrix in one model call
+        Returns: (labels, probabilities) with one row per input row
+        """
+        if self.session is not None:
+            # The ONNX model returns labels and probabilities in one run
+            labels, probabilities = self.session.run(None, {'X': feature_matrix})
+            return labels, probabilities
+        
+        if self.forest is not None:
+            probabilities = self.forest_proba(feature_matrix)
+            return self.forest['classes'][probabilities.argmax(axis=1)], probabilities
+        
+        # One predict_proba call; the forest's predict is just its argmax
+        probabilities = self.model.predict_proba(feature_matrix)
+        return self.model.classes_[probabilities.argmax(axis=1)], probabilities
+    
     def predict_legitimate(self, ussd_code: str) -> dict:
         """
         Predict if USSD code is legitimate using ML
         Returns: {"legitimate": bool, "confidence": float, "features": dict}
         """
         try:
-            if self.model is None:
+            if self.model is None and self.forest is None:
                 return {"legitimate": False, "confidence": 0.5, "features": {}}
             
-            features = self.extract_features(ussd_code)
-            feature_vector = [list(features.values())]
-            
-            prediction = self.model.predict(feature_vector)[0]
-            probability = self.model.predict_proba(feature_vector)[0][1]  # Probability of legitimate
+            values = self.feature_values(ussd_code)
+            labels, probabilities = self.score(np.array([values], dtype=np.float32))
             
             return {
-                "legitimate": bool(prediction),
-                "confidence": float(probability),
-                "features": features
+                "legitimate": bool(labels[0]),
+                "confidence": float(probabilities[0, 1]),  # Probability of legitimate
+                "features": dict(zip(FEATURE_NAMES, values))
             }
         except Exception as e:
             logger.error(f"ML prediction failed: {e}")
             return {"legitimate": False, "confidence": 0.5, "features": {}}
     
-    def learn_from_feedback(self, ussd_code: str, is_legitimate: bool):
+    def predict_legitimate_batch(self, ussd_codes: list) -> list:
         """
-        Learn from user feedback to improve model
+        Predict many USSD codes with a single model call
+        Returns: one predict_legitimate result dict per code, in order
         """
         try:
-            # Load existing training data
-            training_data = []
-            if self.training_data_file.exists():
-                with open(self.training_data_file, 'r') as f:
-                    training_data = json.load(f)
+            if self.model is None and self.forest is None:
+                return [{"legitimate": False, "confidence": 0.5, "features": {}} for _ in ussd_codes]
+            if not ussd_codes:
+                return []
             
-            # Add new example
-            training_data.append({
-                "code": ussd_code,
-                "legitimate": is_legitimate,
-                "timestamp": datetime.now().isoformat()
-            })
+            rows = [self.feature_values(code) for code in ussd_codes]
+            labels, probabilities = self.score(np.array(rows, dtype=np.float32))
             
-            # Keep only recent data (last 1000 examples)
-            training_data = training_data[-1000:]
-            
-            # Save updated training data
-            with open(self.training_data_file, 'w') as f:
-                json.dump(training_data, f, indent=2)
-            
-            # Retrain model periodically
-            if len(training_data) % 100 == 0:  # Retrain every 100 new examples
-                self.retrain_model(training_data)
+            return [{
+                "legitimate": bool(label),
+                "confidence": float(probability),  # Probability of legitimate
+                "features": dict(zip(FEATURE_NAMES, values))
+            } for label, probability, values in zip(labels, probabilities[:, 1], rows)]
+        except Exception as e:
+            logger.error(f"ML batch prediction failed: {e}")
+            return [{"legitimate": False, "confidence": 0.5, "features": {}} for _ in ussd_codes]
+    
+    def _count_training_records(self):
+        """Count the stored feedback records, converting a legacy JSON file first"""
+        if not self.training_data_file.exists() and self.legacy_training_data_file.exists():
+            records = _json_loads(self.legacy_training_data_file.read_bytes())
+            self._write_training_records(records[-TRAINING_DATA_LIMIT:])
+        if not self.training_data_file.exists():
+            return 0
+        with open(self.training_data_file, 'rb') as f:
+            return sum(1 for _ in f)
+    
+    def _read_training_records(self):
+        """Return the most recent feedback records, oldest first"""
+        with open(self.training_data_file, 'rb') as f:
+            return [_json_loads(line) for line in deque(f, maxlen=TRAINING_DATA_LIMIT)]
+    
+    def _write_training_records(self, records):
+        """Replace the training file with records"""
+        tmp_file = self.training_data_file.with_suffix('.tmp')
+        tmp_file.write_bytes(b''.join(_json_line(record) for record in records))
+        tmp_file.replace(self.training_data_file)
+    
+    def learn_from_feedback(self, ussd_code: str, is_legitimate: bool):
+        """
+        Learn from user feedback to improve model
+        """
+        try:
+            with self._training_lock:
+                if self.training_record_count is None:
+                    self.training_data_file.parent.mkdir(exist_ok=True)
+                    self.training_record_count = self._count_training_records()
+                
+                # Append the new example; nothing already stored is re-read
+                with open(self.training_data_file, 'ab') as f:
+                    f.write(_json_line({
+                        "code": ussd_code,
+                        "legitimate": is_legitimate,
+                        "timestamp": datetime.now().isoformat()
+                    }))
+                self.training_record_count += 1
+                
+                # Keep only recent data (last 1000 examples)
+                if self.training_record_count >= 2 * TRAINING_DATA_LIMIT:
+                    self._write_training_records(self._read_training_records())
+                    self.training_record_count = TRAINING_DATA_LIMIT
+                
+                # Retrain model periodically
+                if self.training_record_count % 100 == 0:  # Retrain every 100 new examples
+                    self.retrain_model(self._read_training_records())
                 
         except Exception as e:
             logger.error(f"Failed to learn from feedback: {e}")
@@ -7,6 +7,64 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Core safe USSD codes (verified, essential only)
+SAFE_USSD_CODES = [
+    # Banking
+    "*901#", "*902#", "*909#", "*911#", "*826#", "*989#", "*945#", "*322#",
+    # Telecom
+    "*123#", "*124#", "*232#", "*121#", "*310#", "*311#", "*312#", "*323#",
+    # Services
+    "*199#", "*#06#", "*#21#", "*#61#", "*#62#", "*#67#",
+    # Common patterns
+    "*123*1#", "*123*2#", "*123*4#", "*310*1#", "*311*1#"
+]
+
+# High-confidence scam patterns
+SCAM_KEYWORDS = [
+    "won", "win", "prize", "lottery", "million", "cash", "award", "claim",
+    "urgent", "immediately", "bvn", "password", "pin", "transfer", "free",
+    "gift", "congratulations", "congrats", "account", "verification"
+]
+
+# Suspicious USSD patterns
+SUSPICIOUS_PATTERNS = [
+    "*xxx*xxx*xxx*xxx#",  # Too many segments
+    "*xxx*password*",     # Contains sensitive words
+    "*xxx*bvn*",          # BVN requests
+    "*xxx*pin*",          # PIN requests
+    "*xxx*verif*"         # Verification requests
+]
+
+# The mobile database is fixed apart from its generation time, so it is
+# serialized once here with a placeholder stamp that is swapped per write
+MOBILE_DB = {
+    "metadata": {
+        "version": "1.0",
+        "generated_at": "__TS__",
+        "data_size": "compact",
+        "total_codes": len(SAFE_USSD_CODES),
+        "total_keywords": len(SCAM_KEYWORDS)
+    },
+    "safe_ussd_codes": SAFE_USSD_CODES,
+    "scam_keywords": SCAM_KEYWORDS,
+    "suspicious_patterns": SUSPICIOUS_PATTERNS,
+    "rules": {
+        "max_segments": 4,
+        "suspicious_keywords": ["bvn", "pin", "password", "verif"],
+        "safe_prefixes": ["*123", "*310", "*311", "*901", "*909"]
+    }
+}
+
+if orjson is not None:
+    _FROZEN_DB = orjson.dumps(MOBILE_DB)  # compact by default
+else:
+    _FROZEN_DB = json.dumps(MOBILE_DB, separators=(',', ':')).encode()
+
 class MobileDataGenerator:
     def __init__(self):
         self.data_dir = Path("data")
@@ -15,64 +73,17 @@ class MobileDataGenerator:
     
     def generate_mobile_database(self):
         """Create ultra-compact mobile database"""
-        
-        # Core safe USSD codes (verified, essential only)
-        safe_ussd_codes = [
-            # Banking
-            "*901#", "*902#", "*909#", "*911#", "*826#", "*989#", "*945#", "*322#",
-            # Telecom
-            "*123#", "*124#", "*232#", "*121#", "*310#", "*311#", "*312#", "*323#",
-            # Services
-            "*199#", "*#06#", "*#21#", "*#61#", "*#62#", "*#67#",
-            # Common patterns
-            "*123*1#", "*123*2#", "*123*4#", "*310*1#", "*311*1#"
-        ]
-        
-        # High-confidence scam patterns
-        scam_keywords = [
-            "won", "win", "prize", "lottery", "million", "cash", "award", "claim",
-            "urgent", "immediately", "bvn", "password", "pin", "transfer", "free",
-            "gift", "congratulations", "congrats", "account", "verification"
-        ]
-        
-        # Suspicious USSD patterns
-        suspicious_patterns = [
-            "*xxx*xxx*xxx*xxx#",  # Too many segments
-            "*xxx*password*",     # Contains sensitive words
-            "*xxx*bvn*",          # BVN requests
-            "*xxx*pin*",          # PIN requests
-            "*xxx*verif*"         # Verification requests
-        ]
-        
-        # Create mobile-optimized database
-        mobile_db = {
-            "metadata": {
-                "version": "1.0",
-                "generated_at": datetime.now().isoformat(),
-                "data_size": "compact",
-                "total_codes": len(safe_ussd_codes),
-                "total_keywords": len(scam_keywords)
-            },
-            "safe_ussd_codes": safe_ussd_codes,
-            "scam_keywords": scam_keywords,
-            "suspicious_patterns": suspicious_patterns,
-            "rules": {
-                "max_segments": 4,
-                "suspicious_keywords": ["bvn", "pin", "password", "verif"],
-                "safe_prefixes": ["*123", "*310", "*311", "*901", "*909"]
-            }
-        }
+        generated_at = datetime.now().isoformat()
         
         # Save as minified JSON for Android
         mobile_file = self.mobile_dir / "ussd_database.json"
-        with open(mobile_file, 'w') as f:
-            json.dump(mobile_db, f, separators=(',', ':'))
+        mobile_file.write_bytes(_FROZEN_DB.replace(b'"__TS__"', f'"{generated_at}"'.encode(), 1))
         
         print(f"✅ Mobile database created: {mobile_file}")
-        print(f"📊 Stats: {len(safe_ussd_codes)} safe codes, {len(scam_keywords)} scam patterns")
+        print(f"📊 Stats: {len(SAFE_USSD_CODES)} safe codes, {len(SCAM_KEYWORDS)} scam patterns")
         print(f"📱 File size: {mobile_file.stat().st_size} bytes (Perfect for mobile!)")
         
-        return mobile_db
+        return {**MOBILE_DB, "metadata": {**MOBILE_DB["metadata"], "generated_at": generated_at}}
 
 # Run the generator
 if __name__ == "__main__":
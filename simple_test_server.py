@@ -3,31 +3,44 @@ import http.server
 import socketserver
 import json
 import os
+import time
 
 PORT = 8001
 
+# Both responses are fixed, so they are encoded once
+OK_RESPONSE = json.dumps({"status": "OK", "message": "Server is working!"}).encode()
+NOT_FOUND_RESPONSE = json.dumps({"status": "ERROR", "message": "Endpoint not found"}).encode()
+
 class TestHandler(http.server.SimpleHTTPRequestHandler):
+    # Every response carries Content-Length, so clients can keep the
+    # connection open between requests
+    protocol_version = 'HTTP/1.1'
+    
     def do_GET(self):
         print(f"📨 Received request: {self.path}")
         
         if self.path == '/test':
             self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "OK", "message": "Server is working!"}
-            self.wfile.write(json.dumps(response).encode())
+            response = OK_RESPONSE
         else:
             self.send_response(404)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            response = {"status": "ERROR", "message": "Endpoint not found"}
-            self.wfile.write(json.dumps(response).encode())
+            response = NOT_FOUND_RESPONSE
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+class TestServer(socketserver.ThreadingTCPServer):
+    """Serves each connection on its own thread"""
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 128
 
 # Kill any process using the port
 os.system(f"fuser -k {PORT}/tcp > /dev/null 2>&1")
-sleep 1
+time.sleep(1)
 
-with socketserver.TCPServer(("", PORT), TestHandler) as httpd:
+with TestServer(("", PORT), TestHandler) as httpd:
     print(f"🚀 Simple test server started on port {PORT}")
     print("📍 Test with: curl http://localhost:8001/test")
     try:
@@ -3,23 +3,89 @@
 Test Automatic SMS Detection Simulation
 This simulates how the Android app would detect scams automatically
 """
+import hashlib
 import json
+import marshal
 import re
 import os
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# High-risk indicators
+HIGH_RISK_PHRASES = (
+    "won", "prize", "lottery", "congratulations", "claim",
+    "free", "gift", "urgent", "immediately", "million", "cash award"
+)
+
+# Security-related keywords
+SECURITY_KEYWORDS = (
+    "bvn", "password", "pin", "verification", "suspended",
+    "reset", "authenticate", "validate", "confirm", "account"
+)
+
+# Each scored hit is (order, score, reason); hits are reported in order.
+# Every marker of a URL/phone/money heuristic maps to the same hit, so the
+# heuristic counts once however many of its markers appear.
+URL_HIT = (len(HIGH_RISK_PHRASES) + len(SECURITY_KEYWORDS), 8, "suspicious_url")
+PHONE_HIT = (URL_HIT[0] + 1, 7, "phone_request")
+MONEY_HIT = (URL_HIT[0] + 2, 4, "money_mention")
+
+SMS_MARKERS = ([(phrase, (i, 6, phrase)) for i, phrase in enumerate(HIGH_RISK_PHRASES)] +
+               [(keyword, (len(HIGH_RISK_PHRASES) + i, 5, keyword)) for i, keyword in enumerate(SECURITY_KEYWORDS)] +
+               [(marker, URL_HIT) for marker in ("http://", "https://", "www.")] +
+               [(marker, PHONE_HIT) for marker in ("call", "contact", "reply")] +
+               [(marker, MONEY_HIT) for marker in ("$", "cash", "money", "naira")])
+
+# Parsed databases are kept here in marshal form, which loads faster than
+# JSON parses; the file name is keyed on the JSON file's path, size and mtime
+DATABASE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'cyberguard')
+
+def load_compiled_database(database_path):
+    """Load a JSON database, reusing the marshalled copy of an unchanged file"""
+    stat = os.stat(database_path)
+    key = f"{os.path.abspath(database_path)}:{stat.st_size}:{stat.st_mtime_ns}:{marshal.version}"
+    cache_path = os.path.join(DATABASE_CACHE_DIR, hashlib.sha256(key.encode()).hexdigest()[:16] + '.marshal')
+    try:
+        with open(cache_path, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    with open(database_path, 'r') as f:
+        database = json.load(f)
+    try:
+        os.makedirs(DATABASE_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(database, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return database
+
 class AutoSMSDetector:
     def __init__(self):
         self.database = self.load_database()
         self.scam_messages_detected = 0
         self.legitimate_messages_passed = 0
+        
+        # One automaton over every marker: a single pass finds all hits
+        self.marker_ac = None
+        if ahocorasick is not None:
+            self.marker_ac = ahocorasick.Automaton()
+            for marker, hit in SMS_MARKERS:
+                self.marker_ac.add_word(marker, hit)
+            self.marker_ac.make_automaton()
     
     def load_database(self):
         """Load the USSD database"""
         try:
             database_path = 'CyberGuardAndroid/app/src/main/assets/ussd_database.json'
             if os.path.exists(database_path):
-                with open(database_path, 'r') as f:
-                    return json.load(f)
+                return load_compiled_database(database_path)
             return {"safe_codes": [], "scam_patterns": [], "scam_keywords": []}
         except Exception as e:
             print(f"❌ Failed to load database: {e}")
@@ -27,11 +93,20 @@ class AutoSMSDetector:
     
     def simulate_incoming_sms(self, message, sender="Unknown"):
         """Simulate automatic SMS detection like the Android app"""
+        return self.report_incoming_sms(message, sender, self.check_sms_message(message))
+    
+    def simulate_incoming_batch(self, incoming):
+        """Simulate automatic detection for a list of (message, sender) pairs, checked as one batch"""
+        results = self.check_sms_batch([message for message, _ in incoming])
+        for (message, sender), result in zip(incoming, results):
+            self.report_incoming_sms(message, sender, result)
+        return results
+    
+    def report_incoming_sms(self, message, sender, result):
+        """Print the alert the Android app would raise for a checked SMS"""
         print(f"📱 INCOMING SMS from {sender}:")
         print(f"   '{message}'")
         
-        result = self.check_sms_message(message)
-        
         # Simulate automatic alert for high-risk scams
         if not result['safe'] and result['confidence'] >= 75:
             print(f"🚨 AUTOMATIC ALERT: {result['message'].split(chr(10))[0]}")
@@ -46,6 +121,14 @@ class AutoSMSDetector:
         print("")
         return result
     
+    def check_sms_batch(self, messages):
+        """Check a batch of SMS messages, scoring each distinct message once"""
+        results = {}
+        for message in messages:
+            if message not in results:
+                results[message] = self.check_sms_message(message)
+        return [dict(results[message]) for message in messages]
+    
     def check_sms_message(self, message):
         """Enhanced SMS message security check"""
         if not message.strip():
@@ -55,44 +138,24 @@ class AutoSMSDetector:
         score = 0
         reasons = []
         
-        # High-risk indicators
-        high_risk_phrases = [
-            "won", "prize", "lottery", "congratulations", "claim",
-            "free", "gift", "urgent", "immediately", "million", "cash award"
-        ]
-        
-        # Security-related keywords
-        security_keywords = [
-            "bvn", "password", "pin", "verification", "suspended",
-            "reset", "authenticate", "validate", "confirm", "account"
-        ]
-        
-        # Check high-risk phrases
-        for phrase in high_risk_phrases:
-            if phrase in normalized:
-                score += 6
-                reasons.append(phrase)
-        
-        # Check security keywords
-        for keyword in security_keywords:
-            if keyword in normalized:
-                score += 5
-                reasons.append(keyword)
-        
-        # Check for URLs
-        if "http://" in normalized or "https://" in normalized or "www." in normalized:
-            score += 8
-            reasons.append("suspicious_url")
+        if self.marker_ac is not None:
+            hits = {hit for _, hit in self.marker_ac.iter(normalized)}
+        else:
+            # Once a heuristic has a hit, its remaining markers are skipped
+            hits = set()
+            for marker, hit in SMS_MARKERS:
+                if hit not in hits and marker in normalized:
+                    hits.add(hit)
         
-        # Check for phone number requests
-        if ("call" in normalized or "contact" in normalized or "reply" in normalized) and any(char.isdigit() for char in normalized):
-            score += 7
-            reasons.append("phone_request")
+        # A phone request also needs a number in the message
+        if PHONE_HIT in hits and not any(char.isdigit() for char in normalized):
+            hits.discard(PHONE_HIT)
         
-        # Check for money mentions
-        if "$" in normalized or "cash" in normalized or "money" in normalized or "naira" in normalized:
-            score += 4
-            reasons.append("money_mention")
+        # Score high-risk phrases, security keywords, URLs, phone number
+        # requests and money mentions
+        for _, weight, reason in sorted(hits):
+            score += weight
+            reasons.append(reason)
         
         # Determine result
         if score >= 20:
@@ -153,8 +216,7 @@ def main():
     
     print("🔴 TESTING SCAM MESSAGES (Should trigger alerts):")
     print("")
-    for message, scam_type in scam_messages:
-        detector.simulate_incoming_sms(message, f"Scam-{scam_type}")
+    detector.simulate_incoming_batch([(message, f"Scam-{scam_type}") for message, scam_type in scam_messages])
     
     # Test legitimate messages (should not trigger alerts)
     legit_messages = [
@@ -168,8 +230,7 @@ def main():
     
     print("🟢 TESTING LEGITIMATE MESSAGES (No alerts expected):")
     print("")
-    for message, sender in legit_messages:
-        detector.simulate_incoming_sms(message, sender)
+    detector.simulate_incoming_batch(legit_messages)
     
     # Print final statistics
     detector.print_stats()
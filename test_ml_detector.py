@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Test that a saved ML model is reused instead of retrained
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class LoadModelTest(unittest.TestCase):
+    def setUp(self):
+        # The detector reads and writes data/ relative to the working directory
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_second_detector_loads_saved_forest(self):
+        from ml_detector import MLPatternDetector
+
+        MLPatternDetector()
+        with mock.patch.object(MLPatternDetector, 'train_initial_model',
+                               side_effect=AssertionError("model was retrained")):
+            detector = MLPatternDetector()
+        self.assertIsNotNone(detector.forest)
+        self.assertTrue(detector.predict_legitimate("*901#")["legitimate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
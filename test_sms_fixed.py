@@ -1,59 +1,113 @@
 #!/usr/bin/env python3
 import re
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# High-risk patterns
+HIGH_RISK_PATTERNS = [
+    "won.*prize", "win.*lottery", "congratulations.*won", 
+    "claim.*prize", "free.*gift", "urgent.*account",
+    "bvn.*required", "password.*reset", "pin.*verification",
+    "account.*suspended", "verification.*required"
+]
+
+# Medium-risk patterns
+MEDIUM_RISK_PATTERNS = [
+    "million", "cash.*award", "immediately", "click.*link",
+    "call.*now", "limited.*time", "exclusive.*offer"
+]
+
+SCAM_KEYWORDS = ["bvn", "pin", "password", "winner", "won", "prize", "urgent", "verification"]
+
+URL_PATTERN = r'http://|https://|www\.|bit\.ly|tinyurl|click.*here'
+PHONE_PATTERN = r'call.*\d|phone.*number|contact.*us|dial.*\d|send.*number'
+MONEY_PATTERN = r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money'
+
+# With hyperscan, every check above is one pattern in a single database and a
+# message is scanned once. Each entry is (pattern, caseless, score, reason),
+# in the order reasons are reported; keywords are plain substring tests.
+if hyperscan is not None:
+    SMS_SIGNALS = ([(p, True, 8, f"High-risk: '{p}'") for p in HIGH_RISK_PATTERNS] +
+                   [(p, True, 4, f"Medium-risk: '{p}'") for p in MEDIUM_RISK_PATTERNS] +
+                   [(re.escape(k), False, 3, f"Keyword: '{k}'") for k in SCAM_KEYWORDS] +
+                   [(URL_PATTERN, True, 6, "Suspicious URL"),
+                    (PHONE_PATTERN, True, 5, "Phone request"),
+                    (MONEY_PATTERN, True, 3, "Money mention")])
+    
+    SMS_HS_DB = hyperscan.Database()
+    SMS_HS_DB.compile(
+        expressions=[pattern.encode() for pattern, *_ in SMS_SIGNALS],
+        ids=list(range(len(SMS_SIGNALS))),
+        elements=len(SMS_SIGNALS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP |
+               (hyperscan.HS_FLAG_CASELESS if caseless else 0) for _, caseless, *_ in SMS_SIGNALS]
+    )
+    SMS_HS_SCRATCH = hyperscan.Scratch(SMS_HS_DB)
+else:
+    # Without hyperscan, the patterns are compiled once here. Each group is
+    # fused into one alternation of zero-width lookaheads, so a message is
+    # scanned once per group and overlapping hits are all still reported.
+    HIGH_RE = re.compile('|'.join(f'(?=(?P<h{i}>{p}))' for i, p in enumerate(HIGH_RISK_PATTERNS)), re.IGNORECASE)
+    MED_RE = re.compile('|'.join(f'(?=(?P<m{i}>{p}))' for i, p in enumerate(MEDIUM_RISK_PATTERNS)), re.IGNORECASE)
+    HEURISTIC_RE = re.compile(f'(?=(?P<url>{URL_PATTERN}))|(?=(?P<phone>{PHONE_PATTERN}))|(?=(?P<money>{MONEY_PATTERN}))',
+                              re.IGNORECASE)
+
 def test_sms_improved(message):
     normalized = message.lower()
     score = 0
     reasons = []
     
-    # High-risk patterns
-    high_risk_patterns = [
-        "won.*prize", "win.*lottery", "congratulations.*won", 
-        "claim.*prize", "free.*gift", "urgent.*account",
-        "bvn.*required", "password.*reset", "pin.*verification",
-        "account.*suspended", "verification.*required"
-    ]
+    if hyperscan is not None:
+        hits = set()
+        SMS_HS_DB.scan(normalized.encode('utf-8', 'replace'), scratch=SMS_HS_SCRATCH,
+                       match_event_handler=lambda signal_id, *_: hits.add(signal_id))
+        for signal_id, (_, _, weight, reason) in enumerate(SMS_SIGNALS):
+            if signal_id in hits:
+                score += weight
+                reasons.append(reason)
+        return _verdict(score, reasons)
     
-    # Medium-risk patterns
-    medium_risk_patterns = [
-        "million", "cash.*award", "immediately", "click.*link",
-        "call.*now", "limited.*time", "exclusive.*offer"
-    ]
+    hits = {m.lastgroup for regex in (HIGH_RE, MED_RE, HEURISTIC_RE) for m in regex.finditer(normalized)}
     
     # Check patterns with proper regex
-    for pattern in high_risk_patterns:
-        if re.search(pattern, normalized, re.IGNORECASE):
+    for i, pattern in enumerate(HIGH_RISK_PATTERNS):
+        if f'h{i}' in hits:
             score += 8
             reasons.append(f"High-risk: '{pattern}'")
     
-    for pattern in medium_risk_patterns:
-        if re.search(pattern, normalized, re.IGNORECASE):
+    for i, pattern in enumerate(MEDIUM_RISK_PATTERNS):
+        if f'm{i}' in hits:
             score += 4
             reasons.append(f"Medium-risk: '{pattern}'")
     
     # Check individual keywords
-    scam_keywords = ["bvn", "pin", "password", "winner", "won", "prize", "urgent", "verification"]
-    for keyword in scam_keywords:
+    for keyword in SCAM_KEYWORDS:
         if keyword in normalized:
             score += 3
             reasons.append(f"Keyword: '{keyword}'")
     
     # Check URLs
-    if re.search(r'http://|https://|www\.|bit\.ly|tinyurl|click.*here', normalized, re.IGNORECASE):
+    if 'url' in hits:
         score += 6
         reasons.append("Suspicious URL")
     
     # Check phone requests
-    if re.search(r'call.*\d|phone.*number|contact.*us|dial.*\d|send.*number', normalized, re.IGNORECASE):
+    if 'phone' in hits:
         score += 5
         reasons.append("Phone request")
     
     # Check money mentions
-    if re.search(r'\$\d|\d+\s*(dollar|naira|usd)|million|cash|money', normalized, re.IGNORECASE):
+    if 'money' in hits:
         score += 3
         reasons.append("Money mention")
     
-    # Determine result
+    return _verdict(score, reasons)
+
+def _verdict(score, reasons):
+    """Turn a score and its reasons into the result line"""
     if score >= 15:
         return f"🚨 HIGH-RISK SCAM (Score: {score}) - {', '.join(reasons)}"
     elif score >= 10: